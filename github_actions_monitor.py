@@ -11,20 +11,55 @@ Date: July 2025
 
 import os
 import sys
+import asyncio
 import json
+import re
 import time
 import signal
+import atexit
+import email.utils
+import functools
+import queue
+import shlex
 import logging
-import subprocess
+from logging.handlers import QueueHandler, QueueListener
 import threading
 import concurrent.futures
 import pwd
 import grp
+from collections import deque, namedtuple
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Any, Tuple
 import yaml
-from github import Github, GithubException
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# PyGithub is only needed for ad-hoc API use (see the github property); import it on demand
+if TYPE_CHECKING:
+    from github import Github
+
+# Prefer the libyaml-backed C loader for config parsing
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Prefer orjson for state files when installed; both variants produce compact UTF-8 bytes
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj, sort_keys: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj, sort_keys: bool = False) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys).encode()
 
 # Import timezone handling
 try:
@@ -37,6 +72,12 @@ except ImportError:
         # If no timezone library available, we'll use UTC
         zoneinfo = None
 
+
+@functools.lru_cache(maxsize=64)
+def _get_zoneinfo(name: str):
+    """ZoneInfo for an IANA name, built once per process (the set of zones used is tiny)."""
+    return zoneinfo.ZoneInfo(name)
+
 # Load environment variables from .env file if it exists
 try:
     from dotenv import load_dotenv
@@ -56,6 +97,122 @@ except ImportError:
     # python-dotenv not installed, skip .env file loading
     pass
 
+# ${VAR} references substituted from the environment when loading the config
+_ENV_RE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Minimal workflow description cached between poll cycles
+WorkflowInfo = namedtuple('WorkflowInfo', ['id', 'name', 'path', 'node_id'])
+
+# Default command timeouts (seconds) keyed by the executable name
+_TIMEOUT_BY_TOKEN = {
+    'curl': 60, 'wget': 60, 'http': 60,          # HTTP/API requests - short timeout
+    'kubectl': 120,                             # Kubernetes operations - medium timeout
+    'git': 180, 'clone': 180, 'pull': 180, 'push': 180,  # Git operations - medium timeout
+    'docker': 300, 'podman': 300,               # Container operations - longer timeout
+}
+_DEFAULT_COMMAND_TIMEOUT = 120  # 2 minutes default
+
+# Executed runs are identified by (repo_name, workflow_id, run_id)
+RunKey = Tuple[str, int, int]
+
+# Command definition resolved once from the configuration
+CommandDefinition = namedtuple('CommandDefinition', ['name', 'description', 'command', 'working_directory', 'timeout', 'parallel', 'argv'])
+
+# Characters that need a real shell to interpret; commands containing any of them keep the shell path
+_SHELL_METACHARACTERS = frozenset('|&;<>$`*?~(){}[]!#\n')
+
+# Shell builtins that have no executable to exec directly
+_SHELL_BUILTINS = frozenset({'cd', 'export', 'source', '.', 'set', 'unset', 'alias', 'eval', 'exec', 'exit', 'ulimit', 'umask'})
+
+# Most recent runs (of any status) fetched per workflow when polling through GraphQL
+_GRAPHQL_RUN_WINDOW = 20
+
+# Successful runs listed per workflow when polling over REST
+_REST_RUN_PAGE_SIZE = 20
+
+# Workflow run fields fetched per workflow node; the check suite creator is the run's triggering actor
+_GRAPHQL_RUN_FIELDS = '''... on Workflow {
+    runs(first: %d) {
+      nodes {
+        databaseId runNumber createdAt updatedAt
+        checkSuite {
+          status conclusion
+          branch { name }
+          creator { login }
+          commit { oid message messageHeadline author { name } }
+        }
+      }
+    }
+  }''' % _GRAPHQL_RUN_WINDOW
+
+@dataclass
+class MonitorState:
+    """Persistent monitor state, normalized to its runtime types once at load."""
+    # "repo:workflow_id" -> run number tracking started from; "repo:workflow_id:branch" -> last run handled
+    cursor: Dict[str, int] = field(default_factory=dict)
+    etags: Dict[str, str] = field(default_factory=dict)           # conditional-request cache keys -> ETag
+    last_checked_runs: Dict[str, Any] = field(default_factory=dict)
+    executed_runs: Set[RunKey] = field(default_factory=set)       # kept in the executed runs log, not the state file
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Fields written to the state file."""
+        return {'cursor': self.cursor, 'etags': self.etags, 'last_checked_runs': self.last_checked_runs}
+
+
+# Workflows per GraphQL query, keeping each request well inside GitHub's node limits
+_GRAPHQL_BATCH_SIZE = 50
+
+# Pause proactively once fewer than this many core API requests remain in the window
+_RATE_LIMIT_FLOOR = 50
+
+# Cycles a run's commands are attempted before the run is given up on (about five minutes
+# at the default 60s poll interval), so one failing run can't hold back its branch
+_MAX_RUN_ATTEMPTS = 5
+
+# Pages of 100 runs listed per repository when cleaning up executed runs without a recorded time
+_CLEANUP_MAX_PAGES = 10
+
+# Seconds to back off when a Retry-After header cannot be parsed (GitHub asks for at least a minute)
+_DEFAULT_RETRY_AFTER = 60
+
+# Below this many remaining core API requests the adaptive worker count backs off
+_ADAPTIVE_RATE_LIMIT_FLOOR = 500
+
+# Result returned for a command that was killed after exceeding its timeout
+TimeoutResult = namedtuple('TimeoutResult', ['returncode', 'stdout', 'stderr'])
+
+# Trailing output lines kept on the command result
+_OUTPUT_TAIL_LINES = 500
+
+# Longest single output line buffered before it is logged as-is
+_STREAM_LINE_LIMIT = 1024 * 1024
+
+# Bytes read from a command's pipe at a time; each read becomes at most one log record
+_STREAM_READ_SIZE = 64 * 1024
+
+
+# Emoji (plus variation selectors/joiners and one trailing space) dropped from file log lines
+_EMOJI_RE = re.compile('[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF\uFE0F\u200D]+ ?')
+
+
+class _PlainFormatter(logging.Formatter):
+    """Formatter for log files: same layout, but without the console's emoji."""
+    
+    def format(self, record):
+        return _EMOJI_RE.sub('', super().format(record))
+
+
+class _LazyFmt:
+    """Log argument that calls fn(*args) only if the record is actually emitted."""
+    __slots__ = ('fn', 'args')
+    
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+    
+    def __str__(self):
+        return self.fn(*self.args)
+
 
 class GitHubActionsMonitor:
     """Main monitor class for GitHub Actions workflows."""
@@ -65,10 +222,30 @@ class GitHubActionsMonitor:
         self.config_path = config_path
         self.local_mode = local_mode
         self.config = self._load_config()
-        self.github = None
+        self._github = None
+        self._github_token = None
+        self._http = None
+        self._api_base_url = 'https://api.github.com'
+        self._http_timeout = 30
+        self._graphql_url = 'https://api.github.com/graphql'
+        # Rate-limit bucket ("core", "graphql", ...) -> (requests remaining, reset epoch seconds)
+        self._rate_limits: Dict[str, Tuple[int, int]] = {}
+        self._etag_cache: Dict[str, str] = {}
+        self._etag_payloads: Dict[str, Dict] = {}
+        self._workflows_cache: Dict[str, Tuple[float, List[WorkflowInfo]]] = {}
+        self._executed_run_times: Dict[RunKey, float] = {}
+        self._run_attempts: Dict[RunKey, int] = {}  # failed command attempts per run, reset on restart
+        # "repo:workflow_id" -> oldest run number in its last full run listing; older runs can't be
+        # listed again, so branch cursors below it are no longer needed
+        self._run_window_floor: Dict[str, int] = {}
+        self._executed_runs_fp = None
+        self._executed_runs_appends = 0
+        self._executed_runs_migrated = False
+        self._state_dirty = False
+        self._perm_err_counts: Dict[Tuple[str, str], int] = {}
         self.repos = {}
-        self.running = False
-        self.state_data = {}
+        self._shutdown = threading.Event()
+        self.state_data = MonitorState()  # replaced by the persisted state when run() starts
         self.last_health_update = 0
         
         # Parallel processing configuration
@@ -77,6 +254,30 @@ class GitHubActionsMonitor:
         self.repo_timeout = self.config.get('monitoring', {}).get('timeout_per_repo', 60)
         self._execution_lock = threading.Lock()
         self._state_lock = threading.Lock()
+        self._executed_runs_lock = threading.RLock()
+        
+        # Long-lived worker pool reused across poll cycles (keeps HTTP connections warm)
+        self._executor = None
+        self._inflight_repos: Dict[str, concurrent.futures.Future] = {}
+        if self.parallel_enabled:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='gh-poll'
+            )
+        
+        # Adaptive concurrency: checks take a slot; the controller holds back slots to shrink
+        self.adaptive_workers = self.config.get('monitoring', {}).get('adaptive_workers', False)
+        self._worker_slots = threading.Semaphore(self.max_workers)
+        self._active_workers = self.max_workers
+        self._cycle_ewma: Optional[float] = None
+        self._cycle_command_time = 0.0  # seconds spent running commands in the current cycle
+        
+        # Process user/group never change, resolve their names once for debug logging
+        try:
+            self._uid_name = pwd.getpwuid(os.getuid()).pw_name
+            self._gid_name = grp.getgrgid(os.getgid()).gr_name
+        except Exception:
+            self._uid_name = self._gid_name = None
         
         # Setup timezone
         self._setup_timezone()
@@ -88,6 +289,16 @@ class GitHubActionsMonitor:
         # Setup logging
         self._setup_logging()
         
+        # Build lookup structures used on the per-run hot path
+        self._compile_config()
+        
+        # Resolve state/health file locations and create their directories once
+        self._setup_state_paths()
+        
+        # Health check file is kept open and rewritten in place
+        self._health_fd = None
+        self._open_health_check()
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -100,7 +311,7 @@ class GitHubActionsMonitor:
         """Load configuration from YAML file."""
         try:
             with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YamlLoader)
             
             # Substitute environment variables
             config = self._substitute_env_vars(config)
@@ -110,16 +321,82 @@ class GitHubActionsMonitor:
             sys.exit(1)
     
     def _substitute_env_vars(self, obj):
-        """Recursively substitute environment variables in config."""
-        if isinstance(obj, dict):
-            return {key: self._substitute_env_vars(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._substitute_env_vars(item) for item in obj]
-        elif isinstance(obj, str) and obj.startswith("${") and obj.endswith("}"):
-            env_var = obj[2:-1]
-            return os.getenv(env_var, obj)
+        """Substitute ${VAR} environment references anywhere in config strings (in place)."""
+        def replace(value):
+            return _ENV_RE.sub(lambda m: os.environ.get(m.group(1), m.group(0)), value)
+        
+        if isinstance(obj, str):
+            return replace(obj)
+        
+        pending = deque([obj])
+        while pending:
+            node = pending.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, str):
+                    if '${' in value:
+                        node[key] = replace(value)
+                elif isinstance(value, (dict, list)):
+                    pending.append(value)
         return obj
     
+    def _compile_config(self):
+        """Precompute branch/workflow filters and resolved command lists from the configuration."""
+        monitoring_config = self.config.get('monitoring', {})
+        self._branch_allow = frozenset(monitoring_config.get('branches') or []) or None
+        self._workflow_match = frozenset(str(w) for w in monitoring_config.get('workflows') or []) or None
+        
+        commands_config = self.config.get('commands', {})
+        execution_map = commands_config.get('execution_map') or {}
+        command_definitions = commands_config.get('definitions') or {}
+        
+        def build(cmd_name, cmd_config):
+            command = cmd_config.get('command', '')
+            return CommandDefinition(
+                name=cmd_name,
+                description=cmd_config.get('description', cmd_name or 'Unnamed command'),
+                command=command,
+                working_directory=cmd_config.get('working_directory'),
+                timeout=cmd_config.get('timeout', self._get_default_timeout(command)),
+                parallel=bool(cmd_config.get('parallel', False)),
+                # shell: true always goes through /bin/sh; otherwise plain commands are exec'd directly
+                argv=None if cmd_config.get('shell', False) else self._split_command(command)
+            )
+        
+        definitions = {name: build(name, cmd_config) for name, cmd_config in command_definitions.items()}
+        
+        # Flatten execution_map into {(repo, branch): (CommandDefinition, ...)}; '*' keys are kept
+        # as-is and resolved in _get_commands_for_run
+        self._resolved_commands = {}
+        for repo_pattern, branch_map in execution_map.items():
+            for branch_pattern, command_names in (branch_map or {}).items():
+                resolved = []
+                for cmd_name in command_names or []:
+                    if cmd_name in definitions:
+                        resolved.append(definitions[cmd_name])
+                    else:
+                        self.logger.warning(f"Command definition not found: {cmd_name}")
+                self._resolved_commands[(repo_pattern, branch_pattern)] = tuple(resolved)
+        
+        # Legacy on_success configuration is only used when no execution_map is configured
+        self._legacy_commands = ()
+        if not execution_map:
+            self._legacy_commands = tuple(
+                build(cmd_config.get('name'), cmd_config) for cmd_config in commands_config.get('on_success') or []
+            )
+    
+    def _get_commands_for_run(self, repo_name: str, branch_name: str) -> Tuple[CommandDefinition, ...]:
+        """Resolve the commands to execute for a repository/branch."""
+        if not self._resolved_commands:
+            return self._legacy_commands
+        
+        # Most specific match wins, even when it maps to an empty command list
+        resolved = self._resolved_commands
+        for key in ((repo_name, branch_name), (repo_name, '*'), ('*', branch_name), ('*', '*')):
+            if key in resolved:
+                return resolved[key]
+        return ()
+    
     def _setup_timezone(self):
         """Setup timezone configuration."""
         # Get timezone from config, default to Asia/Dhaka
@@ -127,7 +404,7 @@ class GitHubActionsMonitor:
         
         try:
             if zoneinfo:
-                self.display_timezone = zoneinfo.ZoneInfo(timezone_name)
+                self.display_timezone = _get_zoneinfo(timezone_name)
             else:
                 # Fallback to UTC if zoneinfo is not available
                 self.display_timezone = timezone.utc
@@ -139,21 +416,21 @@ class GitHubActionsMonitor:
         
         # Store timezone name for logging
         self.timezone_name = timezone_name if hasattr(self, 'display_timezone') and self.display_timezone != timezone.utc else 'UTC'
+        self._tz_suffix = f' {self.timezone_name}'
     
     def _format_timestamp(self, dt):
         """Format datetime with configured timezone."""
         if dt is None:
             return "unknown"
         
-        # Convert UTC datetime to display timezone
+        # Naive datetimes are UTC; aware ones convert straight to the display timezone
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        elif dt.tzinfo != timezone.utc:
-            dt = dt.astimezone(timezone.utc)
+        d = dt.astimezone(self.display_timezone)
         
-        # Convert to display timezone
-        display_dt = dt.astimezone(self.display_timezone)
-        return display_dt.strftime(f'%Y-%m-%d %H:%M:%S {self.timezone_name}')
+        # Build the string directly; strftime goes through the locale machinery
+        return (f"{d.year:04d}-{d.month:02d}-{d.day:02d} "
+                f"{d.hour:02d}:{d.minute:02d}:{d.second:02d}{self._tz_suffix}")
     
     def _get_current_time(self):
         """Get current time in UTC for internal calculations."""
@@ -196,6 +473,9 @@ class GitHubActionsMonitor:
         # Clear any existing handlers
         self.logger.handlers = []
         
+        # Output handlers are driven by a listener thread; see the end of this method
+        handlers = []
+        
         # Setup file logging
         file_config = log_config.get('file', {})
         if file_config:
@@ -221,11 +501,12 @@ class GitHubActionsMonitor:
                 # Set the suffix for rotated files (YYYY-MM-DD format)
                 file_handler.suffix = "%Y-%m-%d"
                 
-                file_formatter = logging.Formatter(
+                # Emoji stay on the console only; they add bytes to every file record
+                file_formatter = _PlainFormatter(
                     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
                 )
                 file_handler.setFormatter(file_formatter)
-                self.logger.addHandler(file_handler)
+                handlers.append(file_handler)
                 
                 if self.local_mode:
                     print(f"Logging to file: {log_path}")
@@ -245,66 +526,239 @@ class GitHubActionsMonitor:
                 '%(asctime)s - %(levelname)s - %(message)s'
             )
             console_handler.setFormatter(console_formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
+        
+        # Callers only enqueue records; a single listener thread does the file/console writes
+        # (and log rotation) so polling and command threads never block on log I/O
+        self._log_handlers = tuple(handlers)
+        self._log_listener = None
+        if handlers:
+            log_queue = queue.SimpleQueue()
+            self.logger.addHandler(QueueHandler(log_queue))
+            self._log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            self._log_listener.start()
+            atexit.register(self._stop_logging)
+    
+    def _stop_logging(self):
+        """Stop the log listener thread after it has written all queued records."""
+        listener, self._log_listener = self._log_listener, None
+        if listener is not None:
+            listener.stop()
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         self.logger.info(f"Received signal {signum}, shutting down gracefully...")
-        self.running = False
+        self._shutdown.set()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._close_health_check()
+    
+    def _setup_state_paths(self):
+        """Resolve the state, executed runs and health file paths and create their directories."""
+        state_config = self.config.get('state', {})
+        self._state_path = Path(state_config.get('state_file', '/var/lib/github-actions-monitor/state.json'))
+        self._state_tmp_path = self._state_path.with_suffix('.json.tmp')
+        
+        # Append-only executed runs log (NDJSON), next to the state file unless configured
+        executed_runs_file = state_config.get('executed_runs_file')
+        if executed_runs_file:
+            self._executed_runs_path = Path(executed_runs_file)
+        else:
+            self._executed_runs_path = self._state_path.with_name('executed_runs.ndjson')
+        
+        health_config = self.config.get('health', {})
+        self._health_enabled = health_config.get('enabled', False)
+        self._health_path = Path(health_config.get('file', '/var/run/github-actions-monitor/health'))
+        
+        directories = {self._state_path.parent, self._executed_runs_path.parent}
+        if self._health_enabled:
+            directories.add(self._health_path.parent)
+        for directory in directories:
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                self.logger.warning(f"Could not create directory {directory}: {e}")
     
-    def _load_state(self) -> Dict:
-        """Load state from file."""
-        state_file = self.config.get('state', {}).get('state_file', '/var/lib/github-actions-monitor/state.json')
-        state_path = Path(state_file)
+    def _load_state(self) -> MonitorState:
+        """Load state from file, together with the executed runs log."""
+        state_path = self._state_path
+        raw = {}
         
         if state_path.exists():
             try:
-                with open(state_path, 'r') as f:
-                    state = json.load(f)
-                
-                # Convert executed_runs from list to set for efficient lookups
-                if 'executed_runs' in state and isinstance(state['executed_runs'], list):
-                    state['executed_runs'] = set(state['executed_runs'])
-                elif 'executed_runs' not in state:
-                    state['executed_runs'] = set()
-                
-                return state
+                raw = _json_loads(state_path.read_bytes())
             except Exception as e:
                 self.logger.warning(f"Error loading state file: {e}")
         
-        return {'last_checked_runs': {}, 'executed_runs': set()}
+        state = MonitorState(
+            cursor={key: int(value) for key, value in (raw.get('cursor') or {}).items()},
+            etags=dict(raw.get('etags') or {}),
+            last_checked_runs=dict(raw.get('last_checked_runs') or {})
+        )
+        
+        # Legacy state files kept executed_runs inline as a list
+        legacy_runs = raw.get('executed_runs') or []
+        self._executed_run_times = {}
+        # Runs without a recorded time; _cleanup_old_executed_runs looks their times up
+        untimed = set()
+        
+        executed_runs_path = self._executed_runs_path
+        if executed_runs_path.exists():
+            try:
+                with open(executed_runs_path, 'rb') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = _json_loads(line)
+                            run_key = self._parse_run_key(entry['run'])
+                        except (ValueError, KeyError, TypeError):
+                            continue  # Skip a partially written trailing line
+                        recorded_at = entry.get('at')
+                        if recorded_at is None:
+                            untimed.add(run_key)
+                        else:
+                            self._executed_run_times[run_key] = recorded_at
+            except Exception as e:
+                self.logger.warning(f"Error loading executed runs file: {e}")
+        elif legacy_runs:
+            # Migrate: legacy entries have no recorded time, compaction writes them out untimed
+            for legacy_key in legacy_runs:
+                try:
+                    untimed.add(self._parse_run_key(legacy_key))
+                except (ValueError, TypeError):
+                    continue
+            self._executed_runs_migrated = True
+        
+        state.executed_runs.update(self._executed_run_times)
+        state.executed_runs.update(untimed)
+        # Rewrite once after loading (drops migrated fields); afterwards only when something changes
+        self._state_dirty = True
+        return state
+    
+    @staticmethod
+    def _parse_run_key(value) -> RunKey:
+        """Build a run key from its stored form: [repo, workflow_id, run_id] or legacy "repo:workflow_id:run_id"."""
+        if isinstance(value, str):
+            value = value.rsplit(':', 2)
+        repo_name, workflow_id, run_id = value
+        # Interned so the thousands of loaded keys share one string per repository, and key
+        # comparisons against the monitor's own repo names short-circuit on identity
+        return (sys.intern(repo_name), int(workflow_id), int(run_id))
+    
+    def _record_executed_run(self, run_key: RunKey):
+        """Mark a run as executed and append it to the executed runs log."""
+        with self._executed_runs_lock:
+            self.state_data.executed_runs.add(run_key)
+            
+            now = time.time()
+            self._executed_run_times[run_key] = now
+            
+            try:
+                if self._executed_runs_fp is None:
+                    # Unbuffered: each record reaches the file in a single write
+                    self._executed_runs_fp = open(self._executed_runs_path, 'ab', buffering=0)
+                self._executed_runs_fp.write(_json_dumps({'run': run_key, 'at': int(now)}) + b'\n')
+            except Exception as e:
+                self.logger.error(f"Error appending to executed runs file: {e}")
+            
+            self._executed_runs_appends += 1
+        
+        if self._executed_runs_appends >= 1000:
+            self._compact_executed_runs()
+    
+    def _compact_executed_runs(self):
+        """Rewrite the executed runs log keeping only recent entries."""
+        with self._executed_runs_lock:
+            # Untimed runs are kept until _cleanup_old_executed_runs has looked up their age
+            executed_runs = self.state_data.executed_runs
+            untimed = [run_key for run_key in executed_runs if run_key not in self._executed_run_times]
+            
+            cutoff = time.time() - 604800  # 7 days = 604800 seconds
+            recent = sorted(
+                ((ts, run_key) for run_key, ts in self._executed_run_times.items() if ts >= cutoff),
+                reverse=True
+            )[:10000]
+            self._executed_run_times = {run_key: ts for ts, run_key in recent}
+            
+            executed_runs.intersection_update(self._executed_run_times)
+            executed_runs.update(untimed)
+            
+            executed_runs_path = self._executed_runs_path
+            tmp_path = executed_runs_path.with_name(executed_runs_path.name + '.tmp')
+            try:
+                with open(tmp_path, 'wb') as f:
+                    for run_key in untimed:
+                        f.write(_json_dumps({'run': run_key}) + b'\n')
+                    for ts, run_key in reversed(recent):
+                        f.write(_json_dumps({'run': run_key, 'at': int(ts)}) + b'\n')
+                
+                if self._executed_runs_fp is not None:
+                    self._executed_runs_fp.close()
+                    self._executed_runs_fp = None
+                os.replace(tmp_path, executed_runs_path)
+                self._executed_runs_appends = 0
+            except Exception as e:
+                self.logger.error(f"Error compacting executed runs file: {e}")
     
     def _save_state(self):
-        """Save state to file."""
-        state_file = self.config.get('state', {}).get('state_file', '/var/lib/github-actions-monitor/state.json')
-        state_path = Path(state_file)
+        """Save core state to file (executed runs are kept in their own log)."""
+        # Most cycles find nothing new; skip serializing and writing entirely then
+        if not self._state_dirty:
+            return
         
         try:
-            state_path.parent.mkdir(parents=True, exist_ok=True)
+            # Cleared first so a change made while writing is picked up by the next save
+            self._state_dirty = False
             
-            # Convert set to list for JSON serialization
-            state_to_save = self.state_data.copy()
-            if 'executed_runs' in state_to_save and isinstance(state_to_save['executed_runs'], set):
-                state_to_save['executed_runs'] = list(state_to_save['executed_runs'])
+            # State is machine-read only, so serialize compactly (sorted keys keep the output stable)
+            payload = _json_dumps(self.state_data.to_json(), sort_keys=True)
             
-            with open(state_path, 'w') as f:
-                json.dump(state_to_save, f, indent=2)
+            # Write a temp file and rename it over the old state so a crash never leaves it half-written
+            self._state_tmp_path.write_bytes(payload)
+            os.replace(self._state_tmp_path, self._state_path)
         except Exception as e:
+            self._state_dirty = True
             self.logger.error(f"Error saving state file: {e}")
     
+    def _open_health_check(self):
+        """Open the health check file once; it is rewritten in place on each update."""
+        if not self._health_enabled:
+            return
+        
+        try:
+            self._health_fd = os.open(self._health_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        except Exception as e:
+            self.logger.error(f"Error opening health check file: {e}")
+    
+    def _close_health_check(self):
+        """Flush and close the health check file."""
+        fd, self._health_fd = self._health_fd, None
+        if fd is None:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
     def _update_health_check(self):
         """Update health check file."""
-        health_config = self.config.get('health', {})
-        if not health_config.get('enabled', False):
+        if not self._health_enabled:
             return
         
-        health_file = health_config.get('file', '/var/run/github-actions-monitor/health')
-        health_path = Path(health_file)
+        if self._health_fd is None:
+            self._open_health_check()
+            if self._health_fd is None:
+                return
         
         try:
-            health_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(health_path, 'w') as f:
-                f.write(f"OK - {self._get_current_time().isoformat()}")
+            payload = f"OK - {self._get_current_time().isoformat()}".encode()
+            os.lseek(self._health_fd, 0, os.SEEK_SET)
+            os.write(self._health_fd, payload)
+            os.ftruncate(self._health_fd, len(payload))
             self.last_health_update = time.time()
         except Exception as e:
             self.logger.error(f"Error updating health check file: {e}")
@@ -322,27 +776,33 @@ class GitHubActionsMonitor:
             base_url = github_config.get('api_base_url', 'https://api.github.com')
             timeout = github_config.get('timeout', 30)
             
-            self.github = Github(
-                token,
-                base_url=base_url,
-                timeout=timeout,
-                per_page=100
-            )
-            
             # Get repositories
             repositories = self.config.get('repositories', [])
             if not repositories:
                 raise ValueError("No repositories configured for monitoring")
             
+            # All monitoring calls go through one shared HTTP session; PyGithub is only
+            # created on demand (see the github property)
+            self._github = None
+            self._github_token = token
+            self._api_base_url = base_url.rstrip('/')
+            # GitHub Enterprise serves GraphQL at /api/graphql next to the /api/v3 REST root
+            if self._api_base_url.endswith('/api/v3'):
+                self._graphql_url = self._api_base_url[:-len('/v3')] + '/graphql'
+            else:
+                self._graphql_url = self._api_base_url + '/graphql'
+            self._http_timeout = timeout
+            self._http = self._create_http_session(token, len(repositories))
+            
             self.repos = {}
-            for repo_name in repositories:
+            for repo_name in map(sys.intern, repositories):
                 try:
-                    repo = self.github.get_repo(repo_name)
-                    self.repos[repo_name] = repo
-                    self.logger.info(f"Connected to GitHub repository: {repo_name}")
+                    # Test API access with a single repository lookup
+                    response = self._http_get(f"{self._api_base_url}/repos/{repo_name}")
+                    response.raise_for_status()
                     
-                    # Test API access
-                    repo.get_workflows().totalCount
+                    self.repos[repo_name] = response.json()
+                    self.logger.info(f"Connected to GitHub repository: {repo_name}")
                     self.logger.info(f"GitHub API access verified for: {repo_name}")
                     
                 except Exception as e:
@@ -356,222 +816,506 @@ class GitHubActionsMonitor:
             self.logger.error(f"Error initializing GitHub client: {e}")
             raise
     
+    @property
+    def github(self) -> Optional['Github']:
+        """PyGithub client for ad-hoc API use outside the polling loop, created on first access."""
+        if self._github is None and self._github_token:
+            from github import Auth, Github
+            
+            # Same retry policy as the polling session; PyGithub keeps its own keep-alive pool
+            self._github = Github(
+                auth=Auth.Token(self._github_token),
+                base_url=self._api_base_url,
+                timeout=self._http_timeout,
+                per_page=100,
+                retry=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                            allowed_methods=frozenset(['GET', 'HEAD'])),
+                pool_size=max(len(self.repos), 1)
+            )
+        return self._github
+    
+    def _create_http_session(self, token: str, pool_size: int) -> requests.Session:
+        """Create a keep-alive HTTP session for direct GitHub REST API calls."""
+        pool_size = max(pool_size, 1)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD'])
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size * 4, max_retries=retry)
+        
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28'
+        })
+        return session
+    
+    def _http_get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
+        """GET a REST endpoint through the shared session (core rate-limit bucket)."""
+        return self._http_request('get', url, 'core', params=params, headers=headers)
+    
+    def _http_request(self, method: str, url: str, resource: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session while honouring GitHub's rate-limit headers.
+        
+        resource is the rate-limit bucket the request draws from: 'core' for REST, 'graphql' for GraphQL.
+        """
+        send = getattr(self._http, method)
+        
+        # Wait for the window to reset instead of spending the last few requests
+        remaining, reset = self._rate_limits.get(resource, (None, 0))
+        if remaining is not None and remaining < _RATE_LIMIT_FLOOR:
+            wait = reset - time.time()
+            if wait > 0:
+                self.logger.warning("⏳ Only %d %s API requests left, waiting %.0fs for rate limit reset",
+                                    remaining, resource, wait)
+                self._shutdown.wait(timeout=wait)
+            self._rate_limits.pop(resource, None)
+        
+        response = send(url, timeout=self._http_timeout, **kwargs)
+        self._update_rate_limit(response, resource)
+        
+        # Secondary rate limits answer 403/429 with Retry-After; obey it exactly and retry once
+        if response.status_code in (403, 429):
+            retry_after = response.headers.get('Retry-After')
+            remaining, reset = self._rate_limits.get(resource, (None, 0))
+            if retry_after is None and remaining == 0:
+                retry_after = max(reset - time.time(), 0)
+            if retry_after is not None:
+                wait = self._retry_after_seconds(retry_after)
+                self.logger.warning("⏳ Rate limited by GitHub (HTTP %d), retrying in %.0fs", response.status_code, wait)
+                self._shutdown.wait(timeout=wait)
+                response = send(url, timeout=self._http_timeout, **kwargs)
+                self._update_rate_limit(response, resource)
+        
+        return response
+    
+    @staticmethod
+    def _retry_after_seconds(value) -> float:
+        """Seconds to wait for a Retry-After value, given either as delay-seconds or as an HTTP-date."""
+        try:
+            return max(float(value), 0)
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return _DEFAULT_RETRY_AFTER
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(retry_at.timestamp() - time.time(), 0)
+    
+    def _update_rate_limit(self, response: requests.Response, resource: str):
+        """Record the remaining request budget of the rate-limit bucket the response reports on."""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            resource = response.headers.get('X-RateLimit-Resource', resource)
+            self._rate_limits[resource] = (int(remaining), int(response.headers.get('X-RateLimit-Reset', 0)))
+    
+    def _get_with_etag(self, cache_key: str, url: str, params: Optional[Dict] = None):
+        """GET a REST endpoint with If-None-Match, returning (data, status_code).
+        
+        A 304 Not Modified does not count against the rate limit; in that case
+        the payload from the previous 200 response is returned.
+        """
+        headers = {}
+        etag = self._etag_cache.get(cache_key)
+        # Only revalidate a payload we still hold; after a restart the full list is needed again
+        if etag and cache_key in self._etag_payloads:
+            headers['If-None-Match'] = etag
+        
+        response = self._http_get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            return self._etag_payloads[cache_key], 304
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        etag = response.headers.get('ETag')
+        if etag:
+            if self._etag_cache.get(cache_key) != etag:
+                self._etag_cache[cache_key] = etag
+                self._state_dirty = True
+            self._etag_payloads[cache_key] = data
+        return data, response.status_code
+    
+    def _parse_api_timestamp(self, value: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO 8601 timestamp from the GitHub REST API into an aware UTC datetime."""
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+    
+    def _workflow_run_from_payload(self, payload: Dict) -> SimpleNamespace:
+        """Build a lightweight workflow run object from a REST API payload."""
+        return SimpleNamespace(
+            id=payload['id'],
+            name=payload.get('name'),
+            run_number=payload.get('run_number'),
+            status=payload.get('status'),
+            conclusion=payload.get('conclusion'),
+            head_branch=payload.get('head_branch'),
+            head_sha=payload.get('head_sha'),
+            display_title=payload.get('display_title'),
+            created_at=self._parse_api_timestamp(payload.get('created_at')),
+            updated_at=self._parse_api_timestamp(payload.get('updated_at')),
+            head_commit=payload.get('head_commit') or {},
+            actor=payload.get('actor') or {}
+        )
+    
+    def _fetch_workflows(self, repo_name: str) -> List[WorkflowInfo]:
+        """Fetch all workflow definitions for a repository from the REST API."""
+        workflows = []
+        url = f"{self._api_base_url}/repos/{repo_name}/actions/workflows"
+        params = {'per_page': 100}
+        
+        while url:
+            response = self._http_get(url, params=params)
+            response.raise_for_status()
+            for payload in response.json().get('workflows', []):
+                workflows.append(WorkflowInfo(payload['id'], payload.get('name'), payload.get('path', ''),
+                                               payload.get('node_id')))
+            
+            # Follow pagination links; the next URL already carries the query string
+            url = response.links.get('next', {}).get('url')
+            params = None
+        
+        return workflows
+    
     def _get_workflows_to_monitor(self) -> Dict[str, List]:
         """Get list of workflows to monitor for each repository based on configuration."""
         try:
             workflows_by_repo = {}
-            workflows_config = self.config.get('monitoring', {}).get('workflows', [])
+            cache_ttl = self.config.get('monitoring', {}).get('workflows_cache_ttl', 900)
             
-            for repo_name, repo in self.repos.items():
+            for repo_name in self.repos:
                 try:
-                    all_workflows = list(repo.get_workflows())
+                    cached = self._workflows_cache.get(repo_name)
+                    if cached and time.monotonic() - cached[0] < cache_ttl:
+                        all_workflows = cached[1]
+                    else:
+                        try:
+                            all_workflows = self._fetch_workflows(repo_name)
+                            self._workflows_cache[repo_name] = (time.monotonic(), all_workflows)
+                        except Exception as e:
+                            if not cached:
+                                raise
+                            # Keep using the stale list rather than dropping the repository
+                            self.logger.warning("Error refreshing workflows for %s, using cached list: %s", repo_name, e)
+                            all_workflows = cached[1]
                     
-                    if not workflows_config:
+                    workflow_match = self._workflow_match
+                    if not workflow_match:
                         # Monitor all workflows
                         workflows_by_repo[repo_name] = all_workflows
                     else:
-                        # Filter workflows based on configuration
-                        filtered_workflows = []
-                        for workflow in all_workflows:
-                            # Check by name or filename
-                            if (workflow.name in workflows_config or 
-                                str(workflow.id) in workflows_config or
-                                workflow.path.split('/')[-1] in workflows_config):
-                                filtered_workflows.append(workflow)
-                        workflows_by_repo[repo_name] = filtered_workflows
+                        # Filter workflows based on configuration (by name, ID or filename)
+                        workflows_by_repo[repo_name] = [
+                            workflow for workflow in all_workflows
+                            if (workflow.name in workflow_match or
+                                str(workflow.id) in workflow_match or
+                                workflow.path.rsplit('/', 1)[-1] in workflow_match)
+                        ]
                     
-                    self.logger.info(f"Repository {repo_name}: monitoring {len(workflows_by_repo[repo_name])} workflows")
+                    self.logger.info("Repository %s: monitoring %d workflows", repo_name, len(workflows_by_repo[repo_name]))
                     
                 except Exception as e:
-                    self.logger.error(f"Error getting workflows for {repo_name}: {e}")
+                    self.logger.error("Error getting workflows for %s: %s", repo_name, e)
                     workflows_by_repo[repo_name] = []
             
             return workflows_by_repo
             
         except Exception as e:
-            self.logger.error(f"Error getting workflows: {e}")
+            self.logger.error("Error getting workflows: %s", e)
             return {}
     
     def _should_monitor_branch(self, branch: str) -> bool:
         """Check if branch should be monitored based on configuration."""
-        branches_config = self.config.get('monitoring', {}).get('branches', [])
-        
-        if not branches_config:
+        if self._branch_allow is None:
             return True  # Monitor all branches
         
-        return branch in branches_config
+        return branch in self._branch_allow
+    
+    def _get_recent_runs(self, repo_name: str, workflow, count: int, status: Optional[str] = None) -> List:
+        """Get the most recent runs of a workflow with a single REST call."""
+        params = {'per_page': count}
+        if status:
+            params['status'] = status
+        
+        url = f"{self._api_base_url}/repos/{repo_name}/actions/workflows/{workflow.id}/runs"
+        response = self._http_get(url, params=params)
+        response.raise_for_status()
+        return [self._workflow_run_from_payload(payload)
+                for payload in response.json().get('workflow_runs', [])[:count]]
     
-    def _get_new_successful_runs(self, repo_name: str, workflow) -> List:
-        """Get new successful workflow runs for a specific repository and workflow."""
+    def _prefetch_runs(self, workflows_by_repo: Dict[str, List]) -> Dict[Tuple[str, int], List[Dict]]:
+        """Fetch recent runs of every monitored workflow in batched GraphQL queries.
+        
+        Returns {(repo_name, workflow_id): [run payload, ...]} in the REST payload
+        shape, newest first. Returns an empty dict when GraphQL batching is disabled
+        or fails, in which case each workflow is polled over REST as usual.
+        """
+        if not self.config.get('monitoring', {}).get('graphql_batching', False):
+            return {}
+        
         try:
-            # Get recent completed workflow runs
-            runs = workflow.get_runs(status='completed')
-            
-            # Filter for successful runs only
-            successful_runs = [run for run in runs if run.conclusion == 'success']
-            
-            # Get current time for 5-minute check
-            current_time = self._get_current_time()
-            
-            # Get executed runs to avoid duplicate executions
-            executed_runs = self.state_data.get('executed_runs', set())
-            if isinstance(executed_runs, list):
-                executed_runs = set(executed_runs)  # Convert old list format to set
-            
-            new_successful_runs = []
-            
-            for run in successful_runs:
-                # Check if we've already executed commands for this run
-                run_key = f"{repo_name}:{workflow.id}:{run.id}"
-                if run_key in executed_runs:
-                    continue
-                
-                # Check if branch should be monitored
-                if not self._should_monitor_branch(run.head_branch):
-                    continue
-                
-                # Check if run completed within last 5 minutes
-                if run.updated_at:
-                    time_diff = current_time - run.updated_at
-                    if time_diff.total_seconds() > 300:  # 5 minutes = 300 seconds
-                        self.logger.debug(f"Skipping old run: {repo_name}:{workflow.name} #{run.run_number} "
-                                        f"(completed {time_diff.total_seconds():.0f}s ago)")
-                        continue
-                
-                new_successful_runs.append(run)
-                self.logger.debug(f"Found new run within 5min: {repo_name}:{workflow.name} #{run.run_number}")
+            prefetched = self._fetch_runs_graphql(workflows_by_repo)
+        except Exception as e:
+            self.logger.warning("GraphQL run prefetch failed, polling workflows over REST: %s", e)
+            return {}
+        
+        self.logger.debug("Prefetched runs for %d workflows via GraphQL", len(prefetched))
+        return prefetched
+    
+    def _fetch_runs_graphql(self, workflows_by_repo: Dict[str, List]) -> Dict[Tuple[str, int], List[Dict]]:
+        """Fetch the recent runs of the given workflows, up to 50 workflows per GraphQL query.
+        
+        Workflows without a node_id are left out. Raises on request or GraphQL errors.
+        """
+        targets = [(repo_name, workflow) for repo_name, workflows in workflows_by_repo.items()
+                   for workflow in workflows if getattr(workflow, 'node_id', None)]
+        prefetched = {}
+        for start in range(0, len(targets), _GRAPHQL_BATCH_SIZE):
+            batch = targets[start:start + _GRAPHQL_BATCH_SIZE]
+            query = 'query {\n' + '\n'.join(
+                f'  w{i}: node(id: {json.dumps(workflow.node_id)}) {{ {_GRAPHQL_RUN_FIELDS} }}'
+                for i, (_, workflow) in enumerate(batch)
+            ) + '\n}'
+            
+            response = self._http_request('post', self._graphql_url, 'graphql', json={'query': query})
+            response.raise_for_status()
+            body = response.json()
+            if body.get('errors'):
+                raise ValueError(body['errors'][0].get('message', 'GraphQL error'))
+            
+            data = body.get('data') or {}
+            for i, (repo_name, workflow) in enumerate(batch):
+                nodes = ((data.get(f'w{i}') or {}).get('runs') or {}).get('nodes') or []
+                prefetched[(repo_name, workflow.id)] = [
+                    self._run_payload_from_graphql(workflow, node) for node in nodes if node
+                ]
+        
+        return prefetched
+    
+    def _run_payload_from_graphql(self, workflow, node: Dict) -> Dict:
+        """Convert a GraphQL WorkflowRun node into the REST run payload shape."""
+        check_suite = node.get('checkSuite') or {}
+        commit = check_suite.get('commit') or {}
+        author = commit.get('author') or {}
+        return {
+            'id': node['databaseId'],
+            'name': workflow.name,
+            'run_number': node['runNumber'],
+            'status': (check_suite.get('status') or '').lower() or None,
+            'conclusion': (check_suite.get('conclusion') or '').lower() or None,
+            'head_branch': (check_suite.get('branch') or {}).get('name'),
+            'head_sha': commit.get('oid'),
+            'display_title': commit.get('messageHeadline'),
+            'created_at': node.get('createdAt'),
+            'updated_at': node.get('updatedAt'),
+            'head_commit': {'message': commit.get('message'), 'author': {'name': author.get('name')}},
+            'actor': {'login': (check_suite.get('creator') or {}).get('login')}
+        }
+    
+    def _get_new_successful_runs(self, repo_name: str, workflow, payloads: Optional[List[Dict]] = None) -> List:
+        """Get new successful workflow runs for a specific repository and workflow.
+        
+        payloads are run payloads already fetched for this cycle (see _prefetch_runs);
+        without them the runs are requested from the REST API.
+        """
+        try:
+            if payloads is None:
+                payloads = self._fetch_successful_run_payloads(repo_name, workflow)
+                self._note_run_window(repo_name, workflow, payloads, _REST_RUN_PAGE_SIZE)
+            else:
+                self._note_run_window(repo_name, workflow, payloads, _GRAPHQL_RUN_WINDOW)
+                successful = [payload for payload in payloads if payload['conclusion'] == 'success']
+                if not successful and len(payloads) >= _GRAPHQL_RUN_WINDOW:
+                    # A burst of other runs filled the window; list the successful ones over REST
+                    successful = self._fetch_successful_run_payloads(repo_name, workflow)
+                    self._note_run_window(repo_name, workflow, successful, _REST_RUN_PAGE_SIZE)
+                payloads = successful
             
-            return new_successful_runs
+            return self._filter_new_successful_runs(repo_name, workflow, payloads)
             
         except Exception as e:
-            self.logger.error(f"Error getting workflow runs for {repo_name}:{workflow.name}: {e}")
+            self.logger.error("Error getting workflow runs for %s:%s: %s", repo_name, workflow.name, e)
             return []
     
-    def _execute_commands(self, repo_name: str, workflow, workflow_run):
-        """Execute configured commands for successful workflow run."""
-        # Get commands configuration
-        commands_config = self.config.get('commands', {})
+    def _fetch_successful_run_payloads(self, repo_name: str, workflow) -> List[Dict]:
+        """Fetch the most recent successful run payloads of a workflow (newest first)."""
+        # Only fetch the most recent successful runs; GitHub returns them newest first
+        params = {'status': 'success', 'per_page': _REST_RUN_PAGE_SIZE}
+        if self._branch_allow is not None and len(self._branch_allow) == 1:
+            params['branch'] = next(iter(self._branch_allow))
+        
+        url = f"{self._api_base_url}/repos/{repo_name}/actions/workflows/{workflow.id}/runs"
+        data, status_code = self._get_with_etag(f"{repo_name}:{workflow.id}:runs", url, params)
+        return data.get('workflow_runs', [])
+    
+    def _note_run_window(self, repo_name: str, workflow, payloads: List[Dict], window_size: int):
+        """Remember the oldest run number of a run listing that filled its window."""
+        if len(payloads) >= window_size:
+            self._run_window_floor[f"{repo_name}:{workflow.id}"] = min(payload['run_number'] for payload in payloads)
+    
+    def _filter_new_successful_runs(self, repo_name: str, workflow, payloads: List[Dict]) -> List:
+        """Select the runs past their branch's cursor that still need commands.
+        
+        payloads are successful run payloads, newest first. No API requests are made and
+        branch cursors are not moved here; see _advance_cursor.
+        """
+        # Run number the workflow was first tracked from; branches without a cursor start there
+        cursor = self.state_data.cursor
+        workflow_key = f"{repo_name}:{workflow.id}"
+        baseline = cursor.get(workflow_key)
+        
+        if baseline is None:
+            # First time we see this workflow: start from its newest run instead of replaying history;
+            # without a successful run yet it starts from 0, so its first one is handled
+            cursor[workflow_key] = max((payload['run_number'] for payload in payloads), default=0)
+            self._state_dirty = True
+            self.logger.info("Tracking %s:%s from run #%s", repo_name, workflow.name, cursor[workflow_key])
+            return []
+        
+        # Get executed runs to avoid duplicate executions
+        executed_runs = self.state_data.executed_runs
+        
+        new_successful_runs = []
+        
+        # Runs of all branches are interleaved, so each is compared with its own branch's cursor
+        for payload in payloads:
+            branch = payload.get('head_branch') or ''
+            if payload['run_number'] <= cursor.get(f"{workflow_key}:{branch}", baseline):
+                continue
+            
+            # Check if we've already executed commands for this run
+            run_key = (repo_name, workflow.id, payload['id'])
+            if run_key in executed_runs:
+                continue
+            
+            # Check if branch should be monitored
+            if not self._should_monitor_branch(payload.get('head_branch')):
+                continue
+            
+            run = self._workflow_run_from_payload(payload)
+            new_successful_runs.append(run)
+            self.logger.debug("Found new run: %s:%s #%s", repo_name, workflow.name, run.run_number)
+        
+        # Execute in run order so the newest run is handled last
+        new_successful_runs.reverse()
+        return new_successful_runs
+    
+    def _advance_cursor(self, repo_name: str, workflow, workflow_run):
+        """Record a run as handled on its branch's cursor (after its commands succeeded)."""
+        branch_key = f"{repo_name}:{workflow.id}:{workflow_run.head_branch or ''}"
+        cursor = self.state_data.cursor
+        if workflow_run.run_number > cursor.get(branch_key, 0):
+            cursor[branch_key] = workflow_run.run_number
+            self._state_dirty = True
+    
+    def _process_new_runs(self, repo_name: str, workflow, new_runs: List, lock=None):
+        """Execute commands for new runs (oldest first), advancing each branch's cursor on success.
         
-        # Check for new execution_map configuration first
-        execution_map = commands_config.get('execution_map', {})
-        command_definitions = commands_config.get('definitions', {})
+        After a failure the branch's later runs wait for the next cycle, so its cursor never
+        moves past a run whose commands did not run; after _MAX_RUN_ATTEMPTS failed cycles
+        the run is recorded as executed and the branch moves on.
+        """
+        failed_branches = set()
+        for run in new_runs:
+            if self._shutdown.is_set():
+                break
+            if run.head_branch in failed_branches:
+                continue
+            
+            self.logger.info("🔔 New successful workflow run detected: %s - %s - %s (#%s) on branch %s",
+                             repo_name, workflow.name, run.name, run.run_number, run.head_branch)
+            
+            # Execute commands (optionally under a lock to prevent conflicts between threads)
+            if lock is not None:
+                with lock:
+                    started = time.monotonic()
+                    handled = self._execute_commands(repo_name, workflow, run)
+                    self._cycle_command_time += time.monotonic() - started
+            else:
+                handled = self._execute_commands(repo_name, workflow, run)
+            
+            run_key = (repo_name, workflow.id, run.id)
+            if handled:
+                self._run_attempts.pop(run_key, None)
+                self._advance_cursor(repo_name, workflow, run)
+                continue
+            
+            attempts = self._run_attempts.get(run_key, 0) + 1
+            if attempts < _MAX_RUN_ATTEMPTS:
+                self._run_attempts[run_key] = attempts
+                failed_branches.add(run.head_branch)
+                self.logger.warning("Commands failed for %s - %s (#%s), retrying next cycle (attempt %d/%d)",
+                                    repo_name, workflow.name, run.run_number, attempts, _MAX_RUN_ATTEMPTS)
+            else:
+                self._run_attempts.pop(run_key, None)
+                self.logger.error("Giving up on %s - %s (#%s) after %d failed attempts",
+                                  repo_name, workflow.name, run.run_number, attempts)
+                self._record_executed_run(run_key)
+                self._advance_cursor(repo_name, workflow, run)
+    
+    def _execute_commands(self, repo_name: str, workflow, workflow_run) -> bool:
+        """Execute configured commands for successful workflow run.
         
+        Returns True when the run is handled: a command ran, or none are configured for it.
+        """
         # Determine which commands to execute
-        commands_to_execute = []
-        
-        if execution_map:
-            # Use new execution_map configuration
-            branch_name = workflow_run.head_branch or 'unknown'
-            
-            # Look for repo-specific configuration
-            repo_commands = None
-            if repo_name in execution_map:
-                repo_config = execution_map[repo_name]
-                if branch_name in repo_config:
-                    repo_commands = repo_config[branch_name]
-                elif '*' in repo_config:
-                    repo_commands = repo_config['*']
-            
-            # Fall back to default configuration
-            if not repo_commands and '*' in execution_map:
-                default_config = execution_map['*']
-                if branch_name in default_config:
-                    repo_commands = default_config[branch_name]
-                elif '*' in default_config:
-                    repo_commands = default_config['*']
-            
-            if repo_commands:
-                # Convert command names to command definitions
-                for cmd_name in repo_commands:
-                    if cmd_name in command_definitions:
-                        cmd_def = command_definitions[cmd_name].copy()
-                        cmd_def['name'] = cmd_name
-                        commands_to_execute.append(cmd_def)
-                    else:
-                        self.logger.warning(f"Command definition not found: {cmd_name}")
-        else:
-            # Fall back to legacy on_success configuration
-            legacy_commands = commands_config.get('on_success', [])
-            commands_to_execute = legacy_commands
+        commands_to_execute = self._get_commands_for_run(repo_name, workflow_run.head_branch or 'unknown')
         
         if not commands_to_execute:
-            self.logger.info(f"No commands configured for {repo_name} on branch {workflow_run.head_branch}")
-            return
+            self.logger.info("No commands configured for %s on branch %s", repo_name, workflow_run.head_branch)
+            return True
         
         # Create run key for tracking
-        run_key = f"{repo_name}:{workflow.id}:{workflow_run.id}"
+        run_key = (repo_name, workflow.id, workflow_run.id)
         
-        self.logger.info(f"Executing {len(commands_to_execute)} commands for successful workflow run: "
-                        f"{repo_name} - {workflow_run.name} (#{workflow_run.run_number}) on branch {workflow_run.head_branch}")
-        
-        # Track if any commands were executed successfully
-        commands_executed = False
+        self.logger.info("Executing %d commands for successful workflow run: %s - %s (#%s) on branch %s",
+                         len(commands_to_execute), repo_name, workflow_run.name, workflow_run.run_number, workflow_run.head_branch)
         
         # Set environment variables for command execution
         env_vars = self._prepare_command_environment(repo_name, workflow, workflow_run)
         
-        for i, cmd_config in enumerate(commands_to_execute, 1):
-            description = "Unnamed command"  # Default value
-            try:
-                description = cmd_config.get('description', cmd_config.get('name', 'Unnamed command'))
-                command = cmd_config.get('command', '')
-                working_dir = cmd_config.get('working_directory', os.getcwd())
-                # Get timeout from command config, default based on command type
-                timeout = cmd_config.get('timeout', self._get_default_timeout(command))
-                
-                if not command:
-                    self.logger.warning(f"Empty command in configuration: {description}")
-                    continue
-                
-                self.logger.info(f"[{i}/{len(commands_to_execute)}] Executing: {description}")
-                
-                # Log detailed command information for debugging
-                self._log_command_details(command, working_dir, env_vars, description, timeout)
-                
-                # Execute command with enhanced logging
-                result = self._execute_single_command(command, working_dir, env_vars, description, timeout)
-                
-                if result and result.returncode == 0:
-                    self.logger.info(f"✓ Command completed successfully: {description}")
-                    commands_executed = True
-                else:
-                    self.logger.error(f"✗ Command failed: {description}")
-                    if result:
-                        self.logger.error(f"Return code: {result.returncode}")
-                
-            except Exception as e:
-                self.logger.error(f"✗ Error executing command '{description}': {e}")
+        # Run the commands on a private event loop (one per call, so this is safe from worker threads)
+        results = asyncio.run(self._run_commands(commands_to_execute, env_vars))
+        commands_executed = any(results)
         
         # Mark this run as executed to prevent duplicate executions
-        if commands_executed or not commands_to_execute:
-            if 'executed_runs' not in self.state_data:
-                self.state_data['executed_runs'] = set()
-            
-            # Convert to set if it's a list (backward compatibility)
-            if isinstance(self.state_data['executed_runs'], list):
-                self.state_data['executed_runs'] = set(self.state_data['executed_runs'])
-            
-            self.state_data['executed_runs'].add(run_key)
-            self.logger.debug(f"Marked run as executed: {run_key}")
+        if commands_executed:
+            self._record_executed_run(run_key)
+            self.logger.debug("Marked run as executed: %s:%s:%s", *run_key)
+        return commands_executed
     
     def _prepare_command_environment(self, repo_name: str, workflow, workflow_run) -> dict:
         """Prepare environment variables for command execution."""
         env = os.environ.copy()
         
-        # Get commit author information
-        commit_author = 'unknown'
-        try:
-            if workflow_run.head_sha:
-                # Get the repository object
-                repo = self.repos.get(repo_name)
-                if repo:
-                    commit = repo.get_commit(workflow_run.head_sha)
-                    if commit.author:
-                        commit_author = commit.author.login if commit.author.login else commit.author.name
-                    elif commit.commit and commit.commit.author:
-                        commit_author = commit.commit.author.name
-        except Exception as e:
-            self.logger.debug(f"Could not fetch commit author for {workflow_run.head_sha}: {e}")
+        # Get commit author information from the run payload
+        actor = getattr(workflow_run, 'actor', None) or {}
+        head_commit = getattr(workflow_run, 'head_commit', None) or {}
+        commit_author = actor.get('login') or (head_commit.get('author') or {}).get('name')
+        
+        if not commit_author:
+            # Fall back to the commits endpoint only when the payload has no author data
+            commit_author = 'unknown'
+            try:
+                if workflow_run.head_sha and self._http:
+                    url = f"{self._api_base_url}/repos/{repo_name}/commits/{workflow_run.head_sha}"
+                    response = self._http_get(url)
+                    response.raise_for_status()
+                    commit = response.json()
+                    if commit.get('author'):
+                        commit_author = commit['author'].get('login') or commit_author
+                    elif (commit.get('commit') or {}).get('author'):
+                        commit_author = commit['commit']['author'].get('name') or commit_author
+            except Exception as e:
+                self.logger.debug("Could not fetch commit author for %s: %s", workflow_run.head_sha, e)
         
         # Add workflow-specific environment variables
         env.update({
@@ -589,47 +1333,60 @@ class GitHubActionsMonitor:
         return env
     
     def _get_default_timeout(self, command: str) -> int:
-        """Get appropriate timeout based on command type."""
-        command_lower = command.lower()
-        
-        # HTTP/API requests - short timeout
-        if any(keyword in command_lower for keyword in ['curl', 'wget', 'http']):
-            return 60  # 1 minute for HTTP requests
-        
-        # Kubernetes operations - medium timeout
-        if 'kubectl' in command_lower:
-            return 120  # 2 minutes for kubectl commands
+        """Get appropriate timeout based on the command's executable (called at config load)."""
+        try:
+            tokens = shlex.split(command)
+        except ValueError:
+            tokens = command.split()
         
-        # Git operations - medium timeout
-        if any(keyword in command_lower for keyword in ['git', 'clone', 'pull', 'push']):
-            return 180  # 3 minutes for git operations
+        # Look past privilege wrappers such as "sudo kubectl ..."
+        while tokens and tokens[0] == 'sudo':
+            tokens = tokens[1:]
+        if not tokens:
+            return _DEFAULT_COMMAND_TIMEOUT
         
-        # Docker operations - longer timeout
-        if any(keyword in command_lower for keyword in ['docker', 'podman']):
-            return 300  # 5 minutes for container operations
+        first = tokens[0].rsplit('/', 1)[-1].lower()
+        return _TIMEOUT_BY_TOKEN.get(first, _DEFAULT_COMMAND_TIMEOUT)
+    
+    @staticmethod
+    def _split_command(command: str) -> Optional[Tuple[str, ...]]:
+        """Tokenize a plain command for direct exec, or return None if it needs a shell."""
+        if not command or not _SHELL_METACHARACTERS.isdisjoint(command):
+            return None
+        try:
+            argv = tuple(shlex.split(command))
+        except ValueError:
+            return None
         
-        # Default timeout for other commands
-        return 120  # 2 minutes default
+        # "VAR=value cmd" prefixes and builtins only make sense to a shell
+        if not argv or '=' in argv[0] or argv[0] in _SHELL_BUILTINS:
+            return None
+        return argv
     
     def _log_command_details(self, command: str, working_dir: str, env_vars: dict, description: str, timeout: int = 120):
         """Log detailed information about command execution for debugging."""
+        # Everything below is DEBUG output; skip the stat/access/env work entirely otherwise
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
         # Get command logging configuration
         command_log_config = self.config.get('logging', {}).get('commands', {})
         log_permissions = command_log_config.get('log_permissions', True)
         log_environment = command_log_config.get('log_environment', True)
         
-        self.logger.debug(f"=== Command Execution Details ===")
-        self.logger.debug(f"Description: {description}")
-        self.logger.debug(f"Command: {command}")
-        self.logger.debug(f"Working directory: {working_dir}")
-        self.logger.debug(f"Timeout: {timeout}s")
+        debug = self.logger.debug
+        debug("=== Command Execution Details ===")
+        debug("Description: %s", description)
+        debug("Command: %s", command)
+        debug("Working directory: %s", working_dir)
+        debug("Timeout: %ss", timeout)
         
         # Check if working directory exists and is accessible
         if log_permissions:
             try:
                 if os.path.exists(working_dir):
                     dir_stat = os.stat(working_dir)
-                    self.logger.debug(f"Working dir exists: YES (mode: {oct(dir_stat.st_mode)[-3:]})")
+                    debug("Working dir exists: YES (mode: %s)", oct(dir_stat.st_mode)[-3:])
                     
                     # Check if we can read/write/execute in the directory
                     permissions = []
@@ -639,277 +1396,353 @@ class GitHubActionsMonitor:
                         permissions.append("write")
                     if os.access(working_dir, os.X_OK):
                         permissions.append("execute")
-                    self.logger.debug(f"Directory permissions: {', '.join(permissions) if permissions else 'NONE'}")
+                    debug("Directory permissions: %s", ', '.join(permissions) if permissions else 'NONE')
                 else:
-                    self.logger.warning(f"Working directory does not exist: {working_dir}")
+                    self.logger.warning("Working directory does not exist: %s", working_dir)
             except Exception as e:
-                self.logger.warning(f"Cannot check working directory: {e}")
+                self.logger.warning("Cannot check working directory: %s", e)
             
             # Log current user and process info
-            try:
-                import pwd
-                import grp
-                current_user = pwd.getpwuid(os.getuid())
-                current_group = grp.getgrgid(os.getgid())
-                self.logger.debug(f"Running as user: {current_user.pw_name} (uid: {os.getuid()})")
-                self.logger.debug(f"Running as group: {current_group.gr_name} (gid: {os.getgid()})")
-            except Exception as e:
-                self.logger.debug(f"Could not get user/group info: {e}")
+            if self._uid_name is not None:
+                debug("Running as user: %s (uid: %s)", self._uid_name, os.getuid())
+                debug("Running as group: %s (gid: %s)", self._gid_name, os.getgid())
+            else:
+                debug("Could not get user/group info")
         
         # Log workflow-specific environment variables
         if log_environment:
             workflow_env_vars = {k: v for k, v in env_vars.items() 
                                if k in ['REPO_NAME', 'WORKFLOW_NAME', 'BRANCH_NAME', 'RUN_NUMBER', 'COMMIT_SHA', 'COMMIT_MESSAGE', 'COMMIT_AUTHOR']}
             if workflow_env_vars:
-                self.logger.debug(f"Workflow environment variables:")
+                debug("Workflow environment variables:")
                 for k, v in workflow_env_vars.items():
-                    self.logger.debug(f"  {k}={v}")
+                    debug("  %s=%s", k, v)
         
-        self.logger.debug(f"=== End Command Details ===")
+        debug("=== End Command Details ===")
     
-    def _execute_single_command(self, command: str, working_dir: str, env_vars: dict, description: str, timeout: int = 120):
-        """Execute a single command with comprehensive logging and non-blocking behavior."""
+    async def _run_commands(self, commands_to_execute, env_vars: dict) -> List[bool]:
+        """Run commands in order; consecutive commands marked parallel run concurrently."""
+        total = len(commands_to_execute)
+        results = []
+        index = 0
+        
+        while index < total:
+            group = [commands_to_execute[index]]
+            if group[0].parallel:
+                while index + len(group) < total and commands_to_execute[index + len(group)].parallel:
+                    group.append(commands_to_execute[index + len(group)])
+            
+            outcomes = await asyncio.gather(
+                *(self._run_command(index + offset, total, cmd_config, env_vars)
+                  for offset, cmd_config in enumerate(group, 1)),
+                return_exceptions=True
+            )
+            results.extend(outcome is True for outcome in outcomes)
+            index += len(group)
+        
+        return results
+    
+    async def _run_command(self, index: int, total: int, cmd_config, env_vars: dict) -> bool:
+        """Run one configured command and log its outcome. Returns True on success."""
+        description = "Unnamed command"  # Default value
+        try:
+            description = cmd_config.description
+            command = cmd_config.command
+            working_dir = cmd_config.working_directory or os.getcwd()
+            timeout = cmd_config.timeout
+            
+            if not command:
+                self.logger.warning("Empty command in configuration: %s", description)
+                return False
+            
+            self.logger.info("[%s/%s] Executing: %s", index, total, description)
+            
+            # Log detailed command information for debugging
+            self._log_command_details(command, working_dir, env_vars, description, timeout)
+            
+            # Execute command with enhanced logging
+            result = await self._execute_single_command(command, working_dir, env_vars, description, timeout,
+                                                        argv=cmd_config.argv)
+            
+            if result and result.returncode == 0:
+                self.logger.info("✓ Command completed successfully: %s", description)
+                return True
+            
+            self.logger.error("✗ Command failed: %s", description)
+            if result:
+                self.logger.error("Return code: %s", result.returncode)
+            
+        except Exception as e:
+            self.logger.error("✗ Error executing command '%s': %s", description, e)
+        
+        return False
+    
+    async def _stream_command_output(self, stream, label: str, log, log_lines: bool, header: str):
+        """Drain a subprocess stream, logging its lines when log_lines is set.
+        
+        Lines are logged as they arrive, but as one record per pipe read rather
+        than one per line. Returns (line_count, head, tail): head holds at most
+        the first 501 characters of the output and tail the last
+        _OUTPUT_TAIL_LINES lines, so memory stays bounded however much the
+        command prints.
+        """
+        line_count = 0
+        head = ''
+        tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+        pending = b''
+        prefix = f"  {label}: "
+        
+        while True:
+            chunk = await stream.read(_STREAM_READ_SIZE)
+            if chunk:
+                raw_lines = (pending + chunk).split(b'\n')
+                pending = raw_lines.pop()
+                if len(pending) > _STREAM_LINE_LIMIT:
+                    # Don't let a single unterminated line grow without bound
+                    raw_lines.append(pending)
+                    pending = b''
+            else:
+                raw_lines = [pending] if pending else []
+            
+            if raw_lines:
+                tail.extend(raw_lines)
+                # Once the head is full, lines that are not logged only need counting
+                if log_lines or len(head) <= 500:
+                    lines = [raw_line.decode('utf-8', errors='replace').rstrip('\r') for raw_line in raw_lines]
+                    if log_lines:
+                        body = '\n'.join(prefix + line for line in lines)
+                        if line_count == 0:
+                            log("%s\n%s", header, body)
+                        else:
+                            log("%s", body)
+                    if len(head) <= 500:
+                        head = (head + '\n' if line_count else '') + '\n'.join(lines)
+                        head = head[:501]
+                line_count += len(raw_lines)
+            
+            if not chunk:
+                break
+        
+        return line_count, head, b'\n'.join(tail).decode('utf-8', errors='replace').rstrip('\r\n')
+    
+    async def _execute_single_command(self, command: str, working_dir: str, env_vars: dict, description: str, timeout: int = 120,
+                                      argv: Optional[Tuple[str, ...]] = None):
+        """Execute a single command, streaming its output to the log as it runs.
+        
+        When argv is given (plain commands tokenized at config load) the program is
+        exec'd directly; otherwise the command string is run through /bin/sh.
+        """
         # Get command logging configuration
         command_log_config = self.config.get('logging', {}).get('commands', {})
         detailed_output = command_log_config.get('detailed_output', True)
         
+        # Per-line output is only worth decoding and logging if the level lets it through
+        log_stdout_lines = detailed_output and self.logger.isEnabledFor(logging.INFO)
+        log_stderr_lines = detailed_output and self.logger.isEnabledFor(logging.WARNING)
+        
         start_time = time.time()
+        process = None
         
         try:
             # Log command start
-            self.logger.info(f"🚀 Starting command execution: {description}")
+            self.logger.info("🚀 Starting command execution: %s", description)
             
-            # Execute command with enhanced error handling
-            result = subprocess.run(
-                command,
-                shell=True,
+            spawn_options = dict(
                 cwd=working_dir,
                 env=env_vars,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False  # Don't raise exception on non-zero exit codes
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+            if argv:
+                process = await asyncio.create_subprocess_exec(*argv, **spawn_options)
+            else:
+                process = await asyncio.create_subprocess_shell(command, **spawn_options)
+            
+            (stdout_lines, stdout_head, stdout_tail), (stderr_lines, stderr_head, stderr_tail), returncode = await asyncio.wait_for(
+                asyncio.gather(
+                    self._stream_command_output(process.stdout, 'stdout', self.logger.info,
+                                                log_stdout_lines, "📤 Command output:"),
+                    self._stream_command_output(process.stderr, 'stderr', self.logger.warning,
+                                                log_stderr_lines, "⚠️ Command stderr output:"),
+                    process.wait()
+                ),
+                timeout=timeout
             )
             
             execution_time = time.time() - start_time
             
             # Log execution results
-            self.logger.debug(f"⏱️ Command execution completed in {execution_time:.2f}s")
-            self.logger.debug(f"📊 Exit code: {result.returncode}")
+            self.logger.debug("⏱️ Command execution completed in %.2fs", execution_time)
+            self.logger.debug("📊 Exit code: %s", returncode)
             
-            # Log stdout if present
-            if result.stdout:
-                stdout_content = result.stdout.strip()
+            if stdout_lines:
                 if detailed_output:
-                    stdout_lines = stdout_content.split('\n')
-                    self.logger.info(f"📤 Command output ({len(stdout_lines)} lines):")
-                    for line in stdout_lines:
-                        self.logger.info(f"  stdout: {line}")
-                else:
+                    self.logger.debug("📤 Command output: %d lines", stdout_lines)
+                elif len(stdout_head) > 500:
                     # Truncate long output if detailed_output is False
-                    if len(stdout_content) > 500:
-                        self.logger.info(f"📤 Command output (truncated): {stdout_content[:500]}...")
-                    else:
-                        self.logger.info(f"📤 Command output: {stdout_content}")
+                    self.logger.info("📤 Command output (truncated): %s...", stdout_head[:500])
+                else:
+                    self.logger.info("📤 Command output: %s", stdout_head)
             else:
                 self.logger.debug("📭 No stdout output")
             
-            # Log stderr if present (but not as error if command succeeded)
-            if result.stderr:
-                stderr_content = result.stderr.strip()
-                if result.returncode == 0:
-                    # Command succeeded but has stderr - log as warning
-                    if detailed_output:
-                        stderr_lines = stderr_content.split('\n')
-                        self.logger.warning(f"⚠️ Command warning output ({len(stderr_lines)} lines):")
-                        for line in stderr_lines:
-                            self.logger.warning(f"  stderr: {line}")
-                    else:
-                        if len(stderr_content) > 500:
-                            self.logger.warning(f"⚠️ Command warning output (truncated): {stderr_content[:500]}...")
-                        else:
-                            self.logger.warning(f"⚠️ Command warning output: {stderr_content}")
+            # Log stderr (as warning if the command succeeded, as error output otherwise)
+            if stderr_lines and not detailed_output:
+                prefix = "⚠️ Command warning output" if returncode == 0 else "❌ Command error output"
+                if len(stderr_head) > 500:
+                    self.logger.warning("%s (truncated): %s...", prefix, stderr_head[:500])
                 else:
-                    # Command failed - log stderr as error
-                    if detailed_output:
-                        stderr_lines = stderr_content.split('\n')
-                        self.logger.warning(f"❌ Command error output ({len(stderr_lines)} lines):")
-                        for line in stderr_lines:
-                            self.logger.warning(f"  stderr: {line}")
-                    else:
-                        if len(stderr_content) > 500:
-                            self.logger.warning(f"❌ Command error output (truncated): {stderr_content[:500]}...")
-                        else:
-                            self.logger.warning(f"❌ Command error output: {stderr_content}")
+                    self.logger.warning("%s: %s", prefix, stderr_head)
             
-            return result
+            return SimpleNamespace(returncode=returncode, stdout=stdout_tail, stderr=stderr_tail)
             
-        except subprocess.TimeoutExpired as e:
+        except asyncio.TimeoutError:
             execution_time = time.time() - start_time
-            self.logger.error(f"⏱️ Command timed out after {execution_time:.2f}s (limit: {timeout}s): {description}")
-            self.logger.error(f"🔥 Command that timed out: {command}")
-            
-            # Log partial output if available
-            if hasattr(e, 'stdout') and e.stdout:
-                self.logger.warning(f"📤 Partial stdout before timeout: {e.stdout.strip()}")
-            if hasattr(e, 'stderr') and e.stderr:
-                self.logger.warning(f"📤 Partial stderr before timeout: {e.stderr.strip()}")
+            # Kill the whole process group so children of the shell release the pipes too
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await process.wait()
             
-            # Create a mock result object for timeout
-            class TimeoutResult:
-                def __init__(self):
-                    self.returncode = -1  # Indicate timeout
-                    self.stdout = e.stdout if hasattr(e, 'stdout') and e.stdout else ""
-                    self.stderr = f"Command timed out after {timeout} seconds"
+            self.logger.error("⏱️ Command timed out after %.2fs (limit: %ss): %s", execution_time, timeout, description)
+            self.logger.error("🔥 Command that timed out: %s", command)
             
-            return TimeoutResult()
+            # Partial output has already been logged while streaming; -1 indicates the timeout
+            return TimeoutResult(-1, "", f"Command timed out after {timeout} seconds")
             
         except PermissionError as e:
+            if not self.logger.isEnabledFor(logging.ERROR):
+                return None
+            
             execution_time = time.time() - start_time
-            self.logger.error(f"🔒 Permission denied executing command after {execution_time:.2f}s: {description}")
-            self.logger.error(f"🔒 Permission error details: {e}")
+            self.logger.error("🔒 Permission denied executing command after %.2fs: %s", execution_time, description)
+            self.logger.error("🔒 Permission error details: %s", e)
+            
+            # A broken config fails the same way every run; only stat the directory the first time
+            error_key = (command, working_dir)
+            occurrences = self._perm_err_counts.get(error_key, 0) + 1
+            self._perm_err_counts[error_key] = occurrences
+            if occurrences > 1:
+                self.logger.error("🔒 Same permission error %d times; see first occurrence for directory details",
+                                  occurrences)
+                return None
             
             # Try to provide more helpful debugging info
             try:
-                import stat
                 working_dir_stat = os.stat(working_dir)
-                self.logger.error(f"🔍 Working directory permissions: {oct(working_dir_stat.st_mode)[-3:]}")
-                self.logger.error(f"🔍 Working directory owner: uid={working_dir_stat.st_uid}, gid={working_dir_stat.st_gid}")
+                self.logger.error("🔍 Working directory permissions: %s", oct(working_dir_stat.st_mode)[-3:])
+                self.logger.error("🔍 Working directory owner: uid=%s, gid=%s",
+                                  working_dir_stat.st_uid, working_dir_stat.st_gid)
             except Exception as debug_e:
-                self.logger.debug(f"Could not get working directory info: {debug_e}")
+                self.logger.debug("Could not get working directory info: %s", debug_e)
             
             return None
             
         except FileNotFoundError as e:
             execution_time = time.time() - start_time
-            self.logger.error(f"📁 Command not found after {execution_time:.2f}s: {description}")
-            self.logger.error(f"📁 File not found error: {e}")
+            self.logger.error("📁 Command not found after %.2fs: %s", execution_time, description)
+            self.logger.error("📁 File not found error: %s", e)
             return None
             
         except Exception as e:
             execution_time = time.time() - start_time
-            self.logger.error(f"💥 Unexpected error executing command after {execution_time:.2f}s: {description}")
-            self.logger.error(f"💥 Error details: {e}")
-            return None
-            if result.stderr:
-                stderr_content = result.stderr.strip()
-                if detailed_output:
-                    stderr_lines = stderr_content.split('\n')
-                    self.logger.warning(f"Command error output ({len(stderr_lines)} lines):")
-                    for line in stderr_lines:
-                        self.logger.warning(f"  stderr: {line}")
-                else:
-                    # Always show stderr in full for debugging
-                    self.logger.warning(f"Command error output: {stderr_content}")
-            
-            return result
-            
-        except subprocess.TimeoutExpired as e:
-            execution_time = time.time() - start_time
-            self.logger.error(f"Command timed out after {execution_time:.2f}s: {description}")
-            self.logger.error(f"Command that timed out: {command}")
-            if e.stdout:
-                self.logger.error(f"Partial stdout: {e.stdout}")
-            if e.stderr:
-                self.logger.error(f"Partial stderr: {e.stderr}")
-            return None
-            
-        except PermissionError as e:
-            execution_time = time.time() - start_time
-            self.logger.error(f"Permission denied executing command after {execution_time:.2f}s: {description}")
-            self.logger.error(f"Permission error details: {e}")
-            
-            # Additional permission debugging
-            try:
-                self.logger.error(f"Current working directory: {os.getcwd()}")
-                self.logger.error(f"Attempted working directory: {working_dir}")
-                self.logger.error(f"Shell command: {command}")
-                
-                # Check if the shell is accessible
-                import shutil
-                shell_path = shutil.which('sh')
-                if shell_path:
-                    self.logger.error(f"Shell path: {shell_path}")
-                    shell_stat = os.stat(shell_path)
-                    self.logger.error(f"Shell permissions: {oct(shell_stat.st_mode)[-3:]}")
-                else:
-                    self.logger.error("Shell not found in PATH")
-                    
-            except Exception as debug_e:
-                self.logger.error(f"Could not gather additional permission debug info: {debug_e}")
-            
-            return None
-            
-        except FileNotFoundError as e:
-            execution_time = time.time() - start_time
-            self.logger.error(f"File not found executing command after {execution_time:.2f}s: {description}")
-            self.logger.error(f"File not found details: {e}")
-            self.logger.error(f"Command: {command}")
-            self.logger.error(f"Working directory: {working_dir}")
-            
-            # Check if working directory exists
-            if not os.path.exists(working_dir):
-                self.logger.error(f"Working directory does not exist: {working_dir}")
-            
-            return None
-            
-        except Exception as e:
-            execution_time = time.time() - start_time
-            self.logger.error(f"Unexpected error executing command after {execution_time:.2f}s: {description}")
-            self.logger.error(f"Error details: {e}")
-            self.logger.error(f"Error type: {type(e).__name__}")
-            self.logger.error(f"Command: {command}")
-            self.logger.error(f"Working directory: {working_dir}")
+            self.logger.error("💥 Unexpected error executing command after %.2fs: %s", execution_time, description)
+            self.logger.error("💥 Error details: %s", e)
             return None
     
     def _cleanup_old_executed_runs(self):
         """Clean up executed runs older than 7 days to prevent state file bloat."""
         try:
-            if 'executed_runs' not in self.state_data:
-                return
-            
             current_time = self._get_current_time()
-            executed_runs = self.state_data['executed_runs']
-            
-            if isinstance(executed_runs, list):
-                executed_runs = set(executed_runs)
+            executed_runs = self.state_data.executed_runs
             
             runs_to_remove = set()
-            
-            # Check each executed run to see if it's older than 7 days
-            for run_key in executed_runs:
-                try:
-                    # Parse the run key: repo_name:workflow_id:run_id
-                    parts = run_key.split(':')
-                    if len(parts) >= 3:
-                        repo_name = parts[0]
-                        workflow_id = int(parts[1])
-                        run_id = int(parts[2])
-                        
-                        # Get the actual run to check its date
-                        if repo_name in self.repos:
-                            repo = self.repos[repo_name]
-                            try:
-                                run = repo.get_workflow_run(run_id)
-                                if run.updated_at:
-                                    age = current_time - run.updated_at
-                                    if age.total_seconds() > 604800:  # 7 days = 604800 seconds
-                                        runs_to_remove.add(run_key)
-                            except Exception:
-                                # If we can't fetch the run, it might be deleted, so remove it
-                                runs_to_remove.add(run_key)
-                except Exception:
-                    # If we can't parse the run key, remove it
+            cutoff = current_time.timestamp() - 604800  # 7 days = 604800 seconds
+            
+            # Check each executed run against the time it was recorded; no API calls needed
+            untimed: Dict[str, List[RunKey]] = {}
+            for run_key in tuple(executed_runs):
+                recorded_at = self._executed_run_times.get(run_key)
+                if recorded_at is None:
+                    untimed.setdefault(run_key[0], []).append(run_key)
+                elif recorded_at < cutoff:
                     runs_to_remove.add(run_key)
             
-            # Remove old runs
+            # Runs without a recorded time are looked up with one listing per repository
+            for repo_name, run_keys in untimed.items():
+                run_times = self._fetch_recent_run_times(repo_name, cutoff) if repo_name in self.repos else None
+                for run_key in run_keys:
+                    if run_times is None:
+                        # Unmonitored repo or failed lookup; let it age out normally
+                        self._executed_run_times[run_key] = time.time()
+                    elif run_key[2] in run_times:
+                        self._executed_run_times[run_key] = run_times[run_key[2]]
+                    else:
+                        # Not among the runs created since the cutoff: older, or deleted
+                        runs_to_remove.add(run_key)
+            
+            # Remove old runs; also rewrite the log when untimed runs got a time
+            if runs_to_remove or untimed:
+                with self._executed_runs_lock:
+                    executed_runs -= runs_to_remove
+                    for run_key in runs_to_remove:
+                        self._executed_run_times.pop(run_key, None)
+                self._compact_executed_runs()
             if runs_to_remove:
-                self.state_data['executed_runs'] -= runs_to_remove
                 self.logger.info(f"Cleaned up {len(runs_to_remove)} old executed run records")
             
+            self._prune_branch_cursors()
+            
         except Exception as e:
             self.logger.error(f"Error cleaning up old executed runs: {e}")
     
+    def _prune_branch_cursors(self):
+        """Drop branch cursors below their workflow's run window; the workflow baseline covers them."""
+        cursor = self.state_data.cursor
+        stale = []
+        for key, run_number in list(cursor.items()):
+            # Keys are "repo:workflow_id" or "repo:workflow_id:branch" (branch names may contain ':')
+            repo_name, workflow_id, *branch = key.split(':', 2)
+            if branch and run_number < self._run_window_floor.get(f"{repo_name}:{workflow_id}", 0):
+                stale.append(key)
+        
+        if stale:
+            for key in stale:
+                cursor.pop(key, None)
+            self._state_dirty = True
+            self.logger.info("Pruned %d branch cursors older than their workflow's run window", len(stale))
+    
+    def _fetch_recent_run_times(self, repo_name: str, cutoff: float) -> Optional[Dict[int, float]]:
+        """Map run id -> updated_at timestamp for a repository's runs created since cutoff.
+        
+        Returns None if the runs could not all be listed.
+        """
+        try:
+            run_times = {}
+            created = datetime.fromtimestamp(cutoff, timezone.utc).strftime('%Y-%m-%d')
+            url = f"{self._api_base_url}/repos/{repo_name}/actions/runs"
+            params = {'created': f'>={created}', 'per_page': 100}
+            
+            for _ in range(_CLEANUP_MAX_PAGES):
+                response = self._http_get(url, params=params)
+                response.raise_for_status()
+                for payload in response.json().get('workflow_runs', []):
+                    updated_at = self._parse_api_timestamp(payload.get('updated_at'))
+                    run_times[payload['id']] = updated_at.timestamp() if updated_at else time.time()
+                
+                url = response.links.get('next', {}).get('url')
+                params = None
+                if not url:
+                    return run_times
+            
+            # Too many runs to list; a missing id wouldn't mean the run is gone
+            return None
+        except Exception as e:
+            self.logger.debug("Could not list recent runs for %s: %s", repo_name, e)
+            return None
+    
     def _monitor_workflows(self):
         """Main monitoring loop for workflows across all repositories."""
         try:
@@ -921,40 +1754,33 @@ class GitHubActionsMonitor:
             
             total_workflows = sum(len(workflows) for workflows in workflows_by_repo.values())
             current_time = self._get_current_time()
-            self.logger.info(f"Starting monitoring check at {self._format_timestamp(current_time)} - "
-                           f"{total_workflows} workflows across {len(workflows_by_repo)} repositories")
+            self.logger.info("Starting monitoring check at %s - %d workflows across %d repositories",
+                             _LazyFmt(self._format_timestamp, current_time), total_workflows, len(workflows_by_repo))
+            
+            # Optionally fetch every workflow's recent runs up front in batched GraphQL queries
+            prefetched = self._prefetch_runs(workflows_by_repo)
             
             for repo_name, workflows in workflows_by_repo.items():
-                if not self.running:
+                if self._shutdown.is_set():
                     break
                 
-                self.logger.debug(f"Checking repository: {repo_name}")
+                self.logger.debug("Checking repository: %s", repo_name)
                 
                 for workflow in workflows:
-                    if not self.running:
+                    if self._shutdown.is_set():
                         break
                     
                     try:
-                        new_runs = self._get_new_successful_runs(repo_name, workflow)
+                        payloads = prefetched.get((repo_name, workflow.id))
+                        new_runs = self._get_new_successful_runs(repo_name, workflow, payloads)
                         
                         # Log last 2 workflow runs for this workflow
-                        self._log_recent_workflow_runs(repo_name, workflow)
+                        self._log_recent_workflow_runs(repo_name, workflow, payloads)
                         
-                        for run in new_runs:
-                            if not self.running:
-                                break
-                            
-                            self.logger.info(
-                                f"New successful workflow run detected: "
-                                f"{repo_name} - {workflow.name} - {run.name} (#{run.run_number}) "
-                                f"on branch {run.head_branch}"
-                            )
-                            
-                            # Execute commands
-                            self._execute_commands(repo_name, workflow, run)
+                        self._process_new_runs(repo_name, workflow, new_runs)
                         
                     except Exception as e:
-                        self.logger.error(f"Error monitoring workflow {repo_name}:{workflow.name}: {e}")
+                        self.logger.error("Error monitoring workflow %s:%s: %s", repo_name, workflow.name, e)
             
             # Save state after each monitoring cycle
             self._save_state()
@@ -962,11 +1788,11 @@ class GitHubActionsMonitor:
             # Log completion time
             end_time = self._get_current_time()
             duration = (end_time - current_time).total_seconds()
-            self.logger.info(f"Monitoring check completed at {self._format_timestamp(end_time)} "
-                           f"(took {duration:.1f}s)")
+            self.logger.info("Monitoring check completed at %s (took %.1fs)",
+                             _LazyFmt(self._format_timestamp, end_time), duration)
             
         except Exception as e:
-            self.logger.error(f"Error in monitoring cycle: {e}")
+            self.logger.error("Error in monitoring cycle: %s", e)
     
     def _monitor_workflows_parallel(self):
         """Parallel monitoring loop for workflows across all repositories."""
@@ -979,29 +1805,41 @@ class GitHubActionsMonitor:
             
             total_workflows = sum(len(workflows) for workflows in workflows_by_repo.values())
             current_time = self._get_current_time()
-            self.logger.info(f"🔄 Starting parallel monitoring check at {self._format_timestamp(current_time)} - "
-                           f"{total_workflows} workflows across {len(workflows_by_repo)} repositories")
-            
-            # Process repositories in parallel
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all repository checks
-                future_to_repo = {
-                    executor.submit(self._monitor_single_repository, repo_name, workflows): repo_name 
-                    for repo_name, workflows in workflows_by_repo.items()
-                }
-                
-                # Collect results as they complete
-                completed_repos = []
-                for future in concurrent.futures.as_completed(future_to_repo, timeout=self.repo_timeout * 2):
-                    repo_name = future_to_repo[future]
-                    try:
-                        result = future.result(timeout=self.repo_timeout)
-                        completed_repos.append(repo_name)
-                        self.logger.debug(f"✅ Repository {repo_name} check completed")
-                    except concurrent.futures.TimeoutError:
-                        self.logger.error(f"⏱️ Timeout checking repository {repo_name}")
-                    except Exception as e:
-                        self.logger.error(f"❌ Error checking repository {repo_name}: {e}")
+            self.logger.info("🔄 Starting parallel monitoring check at %s - %d workflows across %d repositories",
+                             _LazyFmt(self._format_timestamp, current_time), total_workflows, len(workflows_by_repo))
+            
+            # Optionally fetch every workflow's recent runs up front in batched GraphQL queries
+            prefetched = self._prefetch_runs(workflows_by_repo)
+            self._cycle_command_time = 0.0
+            
+            # Process repositories in parallel on the shared worker pool, skipping any
+            # repository whose check from a previous cycle is still running
+            future_to_repo = {}
+            for repo_name, workflows in workflows_by_repo.items():
+                previous = self._inflight_repos.get(repo_name)
+                if previous and not previous.done():
+                    self.logger.warning("⏳ Previous check for %s still running, skipping this cycle", repo_name)
+                    continue
+                future = self._executor.submit(self._monitor_single_repository, repo_name, workflows, prefetched)
+                self._inflight_repos[repo_name] = future
+                future_to_repo[future] = repo_name
+            
+            # Repositories may queue behind busy worker slots, so the cycle gets twice the per-repo budget
+            done, not_done = concurrent.futures.wait(future_to_repo, timeout=self.repo_timeout * 2)
+            
+            # Collect results
+            completed_repos = []
+            for future in done:
+                repo_name = future_to_repo[future]
+                try:
+                    future.result()
+                    completed_repos.append(repo_name)
+                    self.logger.debug("✅ Repository %s check completed", repo_name)
+                except Exception as e:
+                    self.logger.error("❌ Error checking repository %s: %s", repo_name, e)
+            
+            for future in not_done:
+                self.logger.error("⏱️ Timeout checking repository %s", future_to_repo[future])
             
             # Thread-safe state saving
             with self._state_lock:
@@ -1010,62 +1848,94 @@ class GitHubActionsMonitor:
             # Log completion time
             end_time = self._get_current_time()
             duration = (end_time - current_time).total_seconds()
-            self.logger.info(f"🎯 Parallel monitoring check completed at {self._format_timestamp(end_time)} "
-                           f"(took {duration:.1f}s) - {len(completed_repos)}/{len(workflows_by_repo)} repos processed")
+            self.logger.info("🎯 Parallel monitoring check completed at %s (took %.1fs) - %d/%d repos processed",
+                             _LazyFmt(self._format_timestamp, end_time), duration, len(completed_repos), len(workflows_by_repo))
+            
+            if self.adaptive_workers:
+                # Commands run one at a time under _execution_lock, so their time comes off the cycle
+                self._adjust_workers(max(duration - self._cycle_command_time, 0))
             
         except Exception as e:
-            self.logger.error(f"❌ Error in parallel monitoring cycle: {e}")
+            self.logger.error("❌ Error in parallel monitoring cycle: %s", e)
     
-    def _monitor_single_repository(self, repo_name: str, workflows: List[Any]) -> bool:
+    def _adjust_workers(self, duration: float):
+        """Grow or shrink the number of concurrent repository checks after a parallel cycle.
+        
+        duration excludes command execution. Backs off one worker when the API rate limit runs
+        low, and adds one back (up to max_parallel_workers) while polling takes over half the
+        poll interval.
+        """
+        poll_interval = self.config.get('monitoring', {}).get('poll_interval', 60)
+        self._cycle_ewma = duration if self._cycle_ewma is None else 0.7 * self._cycle_ewma + 0.3 * duration
+        # Polling spends the REST budget; GraphQL prefetches draw on their own bucket
+        core_remaining = self._rate_limits.get('core', (None, 0))[0]
+        rate_limited = core_remaining is not None and core_remaining < _ADAPTIVE_RATE_LIMIT_FLOOR
+        
+        if rate_limited and self._active_workers > 1:
+            # Take a slot out of circulation; if all are busy, try again next cycle
+            if self._worker_slots.acquire(blocking=False):
+                self._active_workers -= 1
+                self.logger.info("👥 Reduced parallel workers to %d (rate limit remaining: %s)",
+                                 self._active_workers, core_remaining)
+        elif not rate_limited and self._active_workers < self.max_workers and self._cycle_ewma > 0.5 * poll_interval:
+            self._worker_slots.release()
+            self._active_workers += 1
+            self.logger.info("👥 Increased parallel workers to %d (average cycle %.1fs)",
+                             self._active_workers, self._cycle_ewma)
+    
+    def _monitor_single_repository(self, repo_name: str, workflows: List[Any],
+                                   prefetched: Optional[Dict[Tuple[str, int], List[Dict]]] = None) -> bool:
         """Monitor workflows for a single repository (thread-safe)."""
+        with self._worker_slots:
+            return self._check_repository(repo_name, workflows, prefetched)
+    
+    def _check_repository(self, repo_name: str, workflows: List[Any],
+                          prefetched: Optional[Dict[Tuple[str, int], List[Dict]]] = None) -> bool:
+        """Check one repository's workflows and execute commands for new successful runs."""
         try:
             thread_id = threading.current_thread().ident
-            self.logger.debug(f"🧵 Thread {thread_id}: Checking repository {repo_name}")
+            self.logger.debug("🧵 Thread %s: Checking repository %s", thread_id, repo_name)
             
             for workflow in workflows:
-                if not self.running:
+                if self._shutdown.is_set():
                     break
                 
                 try:
-                    new_runs = self._get_new_successful_runs(repo_name, workflow)
+                    payloads = (prefetched or {}).get((repo_name, workflow.id))
+                    new_runs = self._get_new_successful_runs(repo_name, workflow, payloads)
                     
                     # Log recent runs
-                    self._log_recent_workflow_runs(repo_name, workflow)
+                    self._log_recent_workflow_runs(repo_name, workflow, payloads)
                     
-                    for run in new_runs:
-                        if not self.running:
-                            break
-                        
-                        self.logger.info(
-                            f"🔔 New successful workflow run detected: "
-                            f"{repo_name} - {workflow.name} - {run.name} (#{run.run_number}) "
-                            f"on branch {run.head_branch}"
-                        )
-                        
-                        # Execute commands (with execution lock to prevent conflicts)
-                        with self._execution_lock:
-                            self._execute_commands(repo_name, workflow, run)
+                    self._process_new_runs(repo_name, workflow, new_runs, lock=self._execution_lock)
                     
                 except Exception as e:
-                    self.logger.error(f"❌ Error monitoring workflow {repo_name}:{workflow.name}: {e}")
+                    self.logger.error("❌ Error monitoring workflow %s:%s: %s", repo_name, workflow.name, e)
             
             return True
             
         except Exception as e:
-            self.logger.error(f"❌ Thread error for {repo_name}: {e}")
+            self.logger.error("❌ Thread error for %s: %s", repo_name, e)
             return False
     
-    def _log_recent_workflow_runs(self, repo_name: str, workflow):
+    def _log_recent_workflow_runs(self, repo_name: str, workflow, payloads: Optional[List[Dict]] = None):
         """Log information about the last 2 workflow runs for debugging."""
+        # The output is INFO only; don't spend an API request when it would be discarded
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         try:
-            # Get recent runs (limit to 2 for logging)
-            recent_runs = list(workflow.get_runs())[:2]
+            # Get recent runs (limit to 2 for logging), reusing prefetched payloads when available
+            if payloads is not None:
+                recent_runs = [self._workflow_run_from_payload(payload) for payload in payloads[:2]]
+            else:
+                recent_runs = self._get_recent_runs(repo_name, workflow, 2)
             
             if not recent_runs:
-                self.logger.debug(f"No recent runs found for {repo_name}:{workflow.name}")
+                self.logger.debug("No recent runs found for %s:%s", repo_name, workflow.name)
                 return
             
-            self.logger.info(f"Last 2 runs for {repo_name}:{workflow.name}:")
+            self.logger.info("Last 2 runs for %s:%s:", repo_name, workflow.name)
             for i, run in enumerate(recent_runs, 1):
                 status_info = f"{run.status}"
                 if run.conclusion:
@@ -1073,7 +1943,7 @@ class GitHubActionsMonitor:
                 
                 run_time = "unknown"
                 if run.updated_at:
-                    run_time = self._format_timestamp(run.updated_at)
+                    run_time = _LazyFmt(self._format_timestamp, run.updated_at)
                 
                 age_info = ""
                 if run.updated_at:
@@ -1086,14 +1956,15 @@ class GitHubActionsMonitor:
                     else:  # More than 1 day
                         age_info = f" ({age_seconds/86400:.0f}d ago)"
                 
-                self.logger.info(f"  {i}. Run #{run.run_number}: {status_info} on {run.head_branch} "
-                                f"at {run_time}{age_info}")
+                self.logger.info("  %s. Run #%s: %s on %s at %s%s",
+                                 i, run.run_number, status_info, run.head_branch, run_time, age_info)
                 
         except Exception as e:
-            self.logger.debug(f"Error logging recent runs for {repo_name}:{workflow.name}: {e}")
+            self.logger.debug("Error logging recent runs for %s:%s: %s", repo_name, workflow.name, e)
     
     def run(self):
         """Main service loop with parallel processing support."""
+        state_loaded = False
         try:
             self.logger.info("🚀 Starting GitHub Actions Monitor Service")
             
@@ -1102,9 +1973,13 @@ class GitHubActionsMonitor:
             
             # Load state
             self.state_data = self._load_state()
+            self._etag_cache = self.state_data.etags
+            state_loaded = True
+            if self._executed_runs_migrated:
+                self._compact_executed_runs()
             
-            # Set running flag
-            self.running = True
+            # Clear the shutdown flag
+            self._shutdown.clear()
             
             # Update health check
             self._update_health_check()
@@ -1116,20 +1991,22 @@ class GitHubActionsMonitor:
             last_cleanup = 0
             
             # Log configuration
-            self.logger.info(f"📊 Monitoring {len(self.repos)} repositories")
-            self.logger.info(f"🔧 Parallel processing: {'enabled' if self.parallel_enabled else 'disabled'}")
+            self.logger.info("📊 Monitoring %d repositories", len(self.repos))
+            self.logger.info("🔧 Parallel processing: %s", 'enabled' if self.parallel_enabled else 'disabled')
             if self.parallel_enabled:
-                self.logger.info(f"👥 Max parallel workers: {self.max_workers}")
-                self.logger.info(f"⏱️ Repository timeout: {self.repo_timeout}s")
-            self.logger.info(f"🔄 Starting monitoring loop with {poll_interval}s interval")
+                self.logger.info("👥 Max parallel workers: %s", self.max_workers)
+                self.logger.info("⏱️ Repository timeout: %ss", self.repo_timeout)
+            self.logger.info("🔄 Starting monitoring loop with %ss interval", poll_interval)
             
-            while self.running:
+            while not self._shutdown.is_set():
                 try:
                     cycle_start = time.time()
+                    info_enabled = self.logger.isEnabledFor(logging.INFO)
                     
-                    # Calculate and log next check time
-                    next_check_time = self._get_current_time() + timedelta(seconds=poll_interval)
-                    next_check_str = self._format_timestamp(next_check_time)
+                    # Calculate next check time (formatted only if it is logged)
+                    if info_enabled:
+                        next_check_time = self._get_current_time() + timedelta(seconds=poll_interval)
+                        next_check_str = _LazyFmt(self._format_timestamp, next_check_time)
                     
                     # Monitor workflows with parallel processing
                     if self.parallel_enabled and len(self.repos) > 1:
@@ -1139,7 +2016,8 @@ class GitHubActionsMonitor:
                     
                     # Calculate cycle duration
                     cycle_duration = time.time() - cycle_start
-                    self.logger.info(f"⏱️ Monitoring cycle completed in {cycle_duration:.2f} seconds")
+                    if info_enabled:
+                        self.logger.info("⏱️ Monitoring cycle completed in %.2f seconds", cycle_duration)
                     
                     # Update health check if needed
                     if (time.time() - self.last_health_update) >= health_interval:
@@ -1151,27 +2029,32 @@ class GitHubActionsMonitor:
                         last_cleanup = time.time()
                     
                     # Log next check time
-                    if self.running:  # Only log if we're still running
-                        self.logger.info(f"Next monitoring check scheduled for: {next_check_str}")
+                    if info_enabled and not self._shutdown.is_set():  # Only log if we're still running
+                        self.logger.info("Next monitoring check scheduled for: %s", next_check_str)
                     
-                    # Sleep until next poll
-                    for _ in range(poll_interval):
-                        if not self.running:
-                            break
-                        time.sleep(1)
+                    # Sleep until next poll; a shutdown signal wakes us immediately
+                    if self._shutdown.wait(timeout=poll_interval):
+                        break
                     
                 except KeyboardInterrupt:
                     self.logger.info("Received keyboard interrupt")
                     break
                 except Exception as e:
-                    self.logger.error(f"Error in main loop: {e}")
-                    time.sleep(poll_interval)
+                    self.logger.error("Error in main loop: %s", e)
+                    self._shutdown.wait(timeout=poll_interval)
             
         except Exception as e:
-            self.logger.error(f"Fatal error: {e}")
+            self.logger.error("Fatal error: %s", e)
             sys.exit(1)
         finally:
+            if self._executor:
+                # Let in-flight repository checks finish so their state is recorded
+                self._executor.shutdown(wait=True, cancel_futures=True)
+            if state_loaded:
+                # Compacting before the log was loaded would rewrite it empty
+                self._compact_executed_runs()
             self.logger.info("GitHub Actions Monitor Service stopped")
+            self._stop_logging()
 
 
 def main():
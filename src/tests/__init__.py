@@ -27,6 +27,7 @@ from .test_utils import (
     check_dependencies,
     show_environment_info,
     create_monitor_instance,
+    ensure_github_initialized,
     print_header,
     print_subheader,
     print_summary,
@@ -41,6 +42,7 @@ __all__ = [
     'check_dependencies',
     'show_environment_info',
     'create_monitor_instance',
+    'ensure_github_initialized',
     'print_header',
     'print_subheader', 
     'print_summary',
@@ -4,9 +4,15 @@ Complete test suite for GitHub Actions Monitor
 Consolidates all test modules into a unified testing interface
 """
 
+import os
+import re
 import sys
 from pathlib import Path
 from .test_utils import *
+from .test_utils import _env_file_path
+
+# Current and rotated log files: monitor.log, monitor.log.2025-07-22, monitor.log.1, monitor.log.gz
+_LOG_RE = re.compile(r'\.log(\.\d{4}-\d{2}-\d{2}|\.\d+|\.gz)?$')
 
 
 def test_overview():
@@ -22,29 +28,32 @@ def test_overview():
     try:
         config_file = get_config_path()
         if config_file.exists():
+            import yaml
+            from github_actions_monitor import _YamlLoader
+            
             with open(config_file, 'r') as f:
-                import yaml
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YamlLoader)
                 
-            print("✅ Configuration file found")
+            # Build the section and write it in one go
+            buf = ["✅ Configuration file found"]
             
             # Show repos
             repos = config.get('repositories', {})
-            print(f"📁 Repositories configured: {len(repos)}")
-            for repo_name in repos:
-                print(f"   • {repo_name}")
+            buf.append(f"📁 Repositories configured: {len(repos)}")
+            buf.extend(f"   • {repo_name}" for repo_name in repos)
             
             # Show timezone
             timezone = config.get('logging', {}).get('timezone', 'Asia/Dhaka')
-            print(f"🌍 Timezone: {timezone}")
+            buf.append(f"🌍 Timezone: {timezone}")
             
             # Show check interval
             check_interval = config.get('check_interval', 60)
-            print(f"⏰ Check interval: {check_interval} seconds")
+            buf.append(f"⏰ Check interval: {check_interval} seconds")
             
             # Show log configuration
             log_level = config.get('logging', {}).get('level', 'INFO')
-            print(f"📋 Log level: {log_level}")
+            buf.append(f"📋 Log level: {log_level}")
+            sys.stdout.write("\n".join(buf) + "\n")
             
         else:
             print("❌ Configuration file not found: config.yaml")
@@ -57,25 +66,30 @@ def test_overview():
     
     project_root = get_project_root()
     env_file = project_root / ".env"
-    if env_file.exists():
+    try:
+        # One stat answers both "does it exist" and "how big is it"
+        file_size = env_file.stat().st_size
         print("✅ Environment file found: .env")
         # Don't read the actual content for security
-        file_size = env_file.stat().st_size
         print(f"   File size: {file_size} bytes")
-    else:
+    except FileNotFoundError:
         print("⚠️  Environment file not found: .env")
         print("   Create .env with GITHUB_TOKEN=your_token")
     
     # Show log directory status
     log_dir = project_root / "logs"
-    if log_dir.exists():
-        log_files = list(log_dir.glob("*.log*"))
+    try:
+        # scandir entries carry the file type from the directory read, so listing needs no extra stats
+        with os.scandir(log_dir) as it:
+            log_files = [entry for entry in it if _LOG_RE.search(entry.name) and entry.is_file()]
+    except FileNotFoundError:
+        print("📁 Log directory: Will be created on first run")
+    else:
+        log_files.sort(key=lambda entry: entry.name)
         print(f"📁 Log directory: {len(log_files)} files")
-        for log_file in sorted(log_files)[-3:]:  # Show last 3 files
+        for log_file in log_files[-3:]:  # Show last 3 files
             file_size = log_file.stat().st_size
             print(f"   • {log_file.name} ({file_size} bytes)")
-    else:
-        print("📁 Log directory: Will be created on first run")
 
 
 def run_all_tests():
@@ -130,26 +144,28 @@ def run_all_tests():
     # Final summary
     print_header("Test Suite Summary")
     
-    for module_name, success in all_results.items():
-        status = "✅ PASSED" if success else "❌ FAILED"
-        print(f"{status} {module_name}")
-    
-    print(f"\nOverall Status: {'✅ ALL TESTS PASSED' if overall_success else '❌ SOME TESTS FAILED'}")
+    buf = [f"{'✅ PASSED' if success else '❌ FAILED'} {module_name}" for module_name, success in all_results.items()]
+    buf.append(f"\nOverall Status: {'✅ ALL TESTS PASSED' if overall_success else '❌ SOME TESTS FAILED'}")
     
     if overall_success:
-        print("\n🎉 Your GitHub Actions Monitor is ready to use!")
-        print("\nNext steps:")
-        print("1. Ensure .env file contains your GITHUB_TOKEN")
-        print("2. Update config.yaml with your repositories")
-        print("3. Run: python github_actions_monitor.py --local")
-        print("4. For production: python github_actions_monitor.py")
+        buf += [
+            "\n🎉 Your GitHub Actions Monitor is ready to use!",
+            "\nNext steps:",
+            "1. Ensure .env file contains your GITHUB_TOKEN",
+            "2. Update config.yaml with your repositories",
+            "3. Run: python github_actions_monitor.py --local",
+            "4. For production: python github_actions_monitor.py"
+        ]
     else:
-        print("\n🔧 Some tests failed. Please check the configuration and dependencies.")
-        print("\nCommon issues:")
-        print("• Missing GITHUB_TOKEN in .env file")
-        print("• Invalid GitHub token or no repository access")
-        print("• Missing dependencies (run: pip install -r requirements.txt)")
-        print("• Network connectivity issues")
+        buf += [
+            "\n🔧 Some tests failed. Please check the configuration and dependencies.",
+            "\nCommon issues:",
+            "• Missing GITHUB_TOKEN in .env file",
+            "• Invalid GitHub token or no repository access",
+            "• Missing dependencies (run: pip install -r requirements.txt)",
+            "• Network connectivity issues"
+        ]
+    sys.stdout.write("\n".join(buf) + "\n")
     
     return overall_success
 
@@ -186,8 +202,8 @@ def run_quick_test():
     
     if not github_token:
         print("❌ GITHUB_TOKEN not found in environment")
-        env_file = get_project_root() / ".env"
-        if env_file.exists():
+        _, env_exists = _env_file_path()
+        if env_exists:
             print("   .env file exists but token not loaded")
         else:
             print("   Create .env file with GITHUB_TOKEN=your_token")
@@ -205,7 +221,7 @@ def run_quick_test():
         print("✅ Monitor instance created successfully")
         
         # Test GitHub connection
-        monitor._initialize_github_client()
+        ensure_github_initialized(monitor)
         if not monitor.github:
             print("❌ Failed to initialize GitHub client")
             return False
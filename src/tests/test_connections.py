@@ -3,11 +3,24 @@
 Configuration and connection tests for GitHub Actions Monitor
 """
 
+from itertools import islice
 from pathlib import Path
 from .test_utils import *
+from .test_utils import _get_shared_monitor
 
+# Config fields that must be set, with the key path to each
+REQUIRED_FIELDS = (
+    ('repositories', ('repositories',)),
+    ('github.token', ('github', 'token')),
+)
 
-def test_config_loading():
+
+def _is_unresolved(value):
+    """True for a config string still holding a ${VAR} reference (the variable was not set)."""
+    return isinstance(value, str) and value.startswith("${")
+
+
+def test_config_loading(monitor=None):
     """Test configuration loading."""
     print_subheader("Testing Configuration Loading")
     
@@ -17,23 +30,21 @@ def test_config_loading():
         return TestResult("Config Loading", False, "Config file not found")
     
     try:
-        monitor = create_monitor_instance(str(config_file), local_mode=True)
+        monitor = monitor or _get_shared_monitor()
         if not monitor:
             return TestResult("Config Loading", False, "Failed to create monitor instance")
         
         print("✅ Configuration loaded successfully")
         
         # Check required fields
-        required_fields = ['repositories', 'github.token']
         issues = []
         
-        for field in required_fields:
-            keys = field.split('.')
+        for field, path in REQUIRED_FIELDS:
             value = monitor.config
-            for key in keys:
-                value = value.get(key, {})
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
             
-            if not value or (isinstance(value, str) and value.startswith("${")):
+            if not value or _is_unresolved(value):
                 print(f"⚠️  Field not configured: {field}")
                 issues.append(field)
             else:
@@ -53,29 +64,41 @@ def test_config_loading():
         return TestResult("Config Loading", False, f"Error: {e}")
 
 
-def test_github_connection():
+def _count_workflows(monitor, repo_name):
+    """Number of workflows in a repository, read from total_count of a one-item page."""
+    response = monitor._http_get(f"{monitor._api_base_url}/repos/{repo_name}/actions/workflows",
+                                 params={'per_page': 1})
+    response.raise_for_status()
+    return response.json().get('total_count', 0)
+
+
+def test_github_connection(monitor=None):
     """Test GitHub API connection."""
     print_subheader("Testing GitHub Connection")
     
     try:
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        from concurrent.futures import ThreadPoolExecutor
+        
+        monitor = monitor or _get_shared_monitor()
         if not monitor:
             return TestResult("GitHub Connection", False, "Failed to create monitor instance")
         
-        monitor._initialize_github_client()
-        
         repositories = monitor.config.get('repositories', [])
         connected_repos = len(monitor.repos)
         
         print(f"✅ Connected to {connected_repos} repositories")
         
+        # List every repository's workflows concurrently; results are printed in repository order
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {repo_name: executor.submit(_count_workflows, monitor, repo_name)
+                       for repo_name in monitor.repos}
+        
         repo_details = {}
-        for repo_name, repo in monitor.repos.items():
+        for repo_name, future in futures.items():
             print(f"   - {repo_name}")
             
             try:
-                workflows = list(repo.get_workflows())
-                workflow_count = len(workflows)
+                workflow_count = future.result()
                 print(f"     Found {workflow_count} workflows")
                 repo_details[repo_name] = {
                     'workflows': workflow_count,
@@ -102,16 +125,15 @@ def test_github_connection():
         return TestResult("GitHub Connection", False, f"Connection failed: {e}")
 
 
-def test_workflow_monitoring():
+def test_workflow_monitoring(monitor=None):
     """Test workflow monitoring functionality."""
     print_subheader("Testing Workflow Monitoring")
     
     try:
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = monitor or _get_shared_monitor()
         if not monitor:
             return TestResult("Workflow Monitoring", False, "Failed to create monitor instance")
         
-        monitor._initialize_github_client()
         monitor.state_data = monitor._load_state()
         
         workflows_by_repo = monitor._get_workflows_to_monitor()
@@ -122,14 +144,27 @@ def test_workflow_monitoring():
         total_runs = 0
         workflow_details = {}
         
-        for repo_name, workflows in workflows_by_repo.items():
+        # Test first 3 workflows for each repo; fetch all their runs in one batched GraphQL query
+        tested_workflows = {repo_name: list(islice(workflows, 3)) for repo_name, workflows in workflows_by_repo.items()}
+        try:
+            prefetched = monitor._fetch_runs_graphql(tested_workflows)
+        except Exception as e:
+            print(f"⚠️  GraphQL batch fetch failed, using REST per workflow: {e}")
+            prefetched = {}
+        
+        for repo_name, workflows in tested_workflows.items():
             print(f"   Repository: {repo_name}")
             workflow_details[repo_name] = []
             
-            # Test first 3 workflows for each repo
-            for workflow in list(workflows)[:3]:
+            for workflow in workflows:
                 try:
-                    runs = list(workflow.get_runs(status='completed'))[:5]  # Last 5 runs
+                    payloads = prefetched.get((repo_name, workflow.id))
+                    if payloads is not None:
+                        # Only the first 5 completed runs are converted
+                        runs = list(islice((monitor._workflow_run_from_payload(payload)
+                                            for payload in payloads if payload['status'] == 'completed'), 5))
+                    else:
+                        runs = monitor._get_recent_runs(repo_name, workflow, 5, status='completed')  # Last 5 runs
                     total_runs += len(runs)
                     
                     workflow_info = {
@@ -175,12 +210,12 @@ def test_workflow_monitoring():
         return TestResult("Workflow Monitoring", False, f"Monitoring test failed: {e}")
 
 
-def test_command_configuration():
+def test_command_configuration(monitor=None):
     """Test command execution configuration."""
     print_subheader("Testing Command Configuration")
     
     try:
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = monitor or _get_shared_monitor()
         if not monitor:
             return TestResult("Command Config", False, "Failed to create monitor instance")
         
@@ -341,19 +376,19 @@ def test_legacy_command_structure(monitor, commands_config):
     })
 
 
-def test_command_execution():
+def test_command_execution(monitor=None):
     """Test command execution functionality with safe test commands."""
     print_subheader("Testing Command Execution")
     
     try:
-        import subprocess
+        import asyncio
         import os
         
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = monitor or _get_shared_monitor()
         if not monitor:
             return TestResult("Command Execution", False, "Failed to create monitor instance")
         
-        # Test safe commands that don't modify the system
+        # Test safe commands that don't modify the system; each runs through the monitor's own executor
         safe_test_commands = [
             {
                 'name': 'test_echo',
@@ -380,31 +415,31 @@ def test_command_execution():
         
         print("Testing safe command execution...")
         
+        # Test environment variables, built once and shared by every command
+        test_env = {
+            **os.environ,
+            'REPO_NAME': 'test/repository',
+            'BRANCH_NAME': 'test-branch',
+            'WORKFLOW_NAME': 'test-workflow',
+            'RUN_NUMBER': '123',
+            'COMMIT_MESSAGE': 'Test commit message'
+        }
+        
         for test_cmd in safe_test_commands:
             print(f"\n   Testing: {test_cmd['name']}")
             print(f"   Command: {test_cmd['command']}")
             
             try:
-                # Set up test environment variables
-                test_env = os.environ.copy()
-                test_env.update({
-                    'REPO_NAME': 'test/repository',
-                    'BRANCH_NAME': 'test-branch',
-                    'WORKFLOW_NAME': 'test-workflow',
-                    'RUN_NUMBER': '123',
-                    'COMMIT_MESSAGE': 'Test commit message'
-                })
-                
-                # Execute the command
-                result = subprocess.run(
+                # Execute the command the way the monitor runs configured commands
+                result = asyncio.run(monitor._execute_single_command(
                     test_cmd['command'],
-                    shell=True,
-                    cwd=test_cmd['working_directory'],
-                    env=test_env,
-                    capture_output=True,
-                    text=True,
+                    test_cmd['working_directory'],
+                    test_env,
+                    test_cmd['description'],
                     timeout=10
-                )
+                ))
+                if result is None:
+                    raise RuntimeError("command could not be started")
                 
                 cmd_result = {
                     'name': test_cmd['name'],
@@ -417,18 +452,13 @@ def test_command_execution():
                 if result.returncode == 0:
                     print(f"   ✅ Success: {result.stdout.strip()}")
                     successful_executions += 1
+                elif result.returncode == -1:
+                    print(f"   ⚠️  Command timed out")
                 else:
                     print(f"   ❌ Failed (exit code {result.returncode}): {result.stderr.strip()}")
                 
                 execution_results.append(cmd_result)
                 
-            except subprocess.TimeoutExpired:
-                print(f"   ⚠️  Command timed out")
-                execution_results.append({
-                    'name': test_cmd['name'],
-                    'error': 'timeout',
-                    'success': False
-                })
             except Exception as e:
                 print(f"   ❌ Error executing command: {e}")
                 execution_results.append({
@@ -459,6 +489,9 @@ def run_connection_tests():
     setup_python_path()
     create_test_directories()
     
+    # Start from a fresh shared monitor (the config or environment may have changed)
+    _get_shared_monitor.cache_clear()
+    
     # Show environment info
     deps = show_environment_info()
     
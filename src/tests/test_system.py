@@ -3,28 +3,40 @@
 Logging and system tests for GitHub Actions Monitor
 """
 
+import functools
+import heapq
+import io
 import logging
+import os
+import sys
+import time
+from collections import namedtuple
 from datetime import datetime, timezone
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 from .test_utils import *
 
 
+# Log files listed individually by the directory structure test (newest first)
+_LOG_LISTING_LIMIT = 10
+
+# One scanned log file; modified is the raw st_mtime
+LogFileInfo = namedtuple('LogFileInfo', ['name', 'size', 'modified'])
+
+
+@functools.lru_cache(maxsize=1)
+def _get_monitor():
+    """Monitor instance shared by the system tests of one run."""
+    return create_monitor_instance(str(get_config_path()), local_mode=True)
+
+
 def test_log_rotation():
     """Test the daily log rotation configuration."""
     print_subheader("Testing Daily Log Rotation Configuration")
     
     try:
-        moni            test_data = [
-            {
-                'repo': 'your-org/your-frontend-repo',
-                'branch': 'your-branch',
-                'expected_commands': execution_map.get('your-org/your-frontend-repo', {}).get('your-branch', [])
-            },
-            {
-                'repo': 'your-org/your-backend-repo', 
-                'branch': 'your-branch',
-                'expected_commands': execution_map.get('your-org/your-backend-repo', {}).get('your-branch', [])
-            }e_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = _get_monitor()
         if not monitor:
             return TestResult("Log Rotation", False, "Failed to create monitor instance")
         
@@ -32,7 +44,7 @@ def test_log_rotation():
         has_timed_handler = False
         handler_info = {}
         
-        for handler in monitor.logger.handlers:
+        for handler in monitor._log_handlers:
             handler_type = type(handler).__name__
             print(f"Found log handler: {handler_type}")
             
@@ -62,6 +74,14 @@ def test_log_rotation():
             monitor.logger.debug("Debug message (may not appear depending on log level)")
             monitor.logger.warning("Warning message for rotation test")
             
+            # The file handler sits behind a QueueHandler; its listener thread does the writes
+            # (and rollover checks). Drain it so the messages above are on disk before reading.
+            listener = monitor._log_listener
+            if listener is not None:
+                print("   ✅ Asynchronous logging: QueueHandler → QueueListener")
+                listener.stop()
+                listener.start()
+            
             # Check log file content
             log_file = Path(handler_info['baseFilename'])
             if log_file.exists():
@@ -69,11 +89,13 @@ def test_log_rotation():
                 print(f"   ✅ Log file exists: {log_file}")
                 print(f"   File size: {file_size} bytes")
                 
-                # Show last few lines
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                    if lines:
-                        print(f"   Last log entry: {lines[-1].strip()}")
+                # Show the last entry, reading only the tail of the file
+                with open(log_file, 'rb') as f:
+                    f.seek(max(0, file_size - 4096))
+                    tail = f.read().decode('utf-8', errors='replace')
+                last_line = next((line for line in reversed(tail.splitlines()) if line.strip()), '')
+                if last_line:
+                    print(f"   Last log entry: {last_line.strip()}")
                 
                 return TestResult("Log Rotation", True, "TimedRotatingFileHandler configured correctly", {
                     'handler_info': handler_info,
@@ -84,7 +106,7 @@ def test_log_rotation():
                 return TestResult("Log Rotation", False, f"Log file not found: {log_file}")
             
         else:
-            available_handlers = [type(h).__name__ for h in monitor.logger.handlers]
+            available_handlers = [type(h).__name__ for h in monitor._log_handlers]
             return TestResult("Log Rotation", False, "TimedRotatingFileHandler not found", {
                 'available_handlers': available_handlers
             })
@@ -98,7 +120,7 @@ def test_timezone_configuration():
     print_subheader("Testing Timezone Configuration")
     
     try:
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = _get_monitor()
         if not monitor:
             return TestResult("Timezone Config", False, "Failed to create monitor instance")
         
@@ -114,36 +136,42 @@ def test_timezone_configuration():
         # Test different timezone configurations
         test_timezones = ["UTC", "America/New_York", "Europe/London", "Asia/Tokyo"]
         timezone_results = {}
+        out = io.StringIO()  # per-timezone lines, written to stdout once after the loop
         
-        for tz_name in test_timezones:
-            try:
-                # Temporarily update config
-                original_tz = monitor.config.get('logging', {}).get('timezone', 'Asia/Dhaka')
-                if 'logging' not in monitor.config:
-                    monitor.config['logging'] = {}
-                monitor.config['logging']['timezone'] = tz_name
-                
-                # Re-setup timezone
-                monitor._setup_timezone()
-                
-                # Test formatting
-                formatted = monitor._format_timestamp(test_time)
-                print(f"   ✅ {tz_name}: {formatted}")
-                timezone_results[tz_name] = {
-                    'formatted': formatted,
-                    'success': True
-                }
-                
-                # Restore original
+        # The monitor is shared with the other tests, so always restore its timezone
+        if 'logging' not in monitor.config:
+            monitor.config['logging'] = {}
+        original_tz = monitor.config['logging'].get('timezone', 'Asia/Dhaka')
+        active_tz = original_tz
+        try:
+            for tz_name in test_timezones:
+                try:
+                    # Temporarily update config and re-setup timezone (only if it differs)
+                    if tz_name != active_tz:
+                        monitor.config['logging']['timezone'] = tz_name
+                        monitor._setup_timezone()
+                        active_tz = tz_name
+                    
+                    # Test formatting
+                    formatted = monitor._format_timestamp(test_time)
+                    print(f"   ✅ {tz_name}: {formatted}", file=out)
+                    timezone_results[tz_name] = {
+                        'formatted': formatted,
+                        'success': True
+                    }
+                    
+                except Exception as e:
+                    print(f"   ❌ {tz_name}: Error - {e}", file=out)
+                    timezone_results[tz_name] = {
+                        'error': str(e),
+                        'success': False
+                    }
+        finally:
+            # Restore original
+            if active_tz != original_tz:
                 monitor.config['logging']['timezone'] = original_tz
                 monitor._setup_timezone()
-                
-            except Exception as e:
-                print(f"   ❌ {tz_name}: Error - {e}")
-                timezone_results[tz_name] = {
-                    'error': str(e),
-                    'success': False
-                }
+        sys.stdout.write(out.getvalue())
         
         successful_timezones = sum(1 for result in timezone_results.values() if result['success'])
         total_timezones = len(test_timezones)
@@ -179,27 +207,33 @@ def test_log_directory_structure():
         if log_dir.exists():
             print("✅ Log directory exists")
             
-            # List all files in log directory
-            log_files = list(log_dir.glob("*.log*"))
+            # List all files in log directory; one stat() per entry (in the comprehension below)
+            with os.scandir(log_dir) as it:
+                log_files = [entry for entry in it if '.log' in entry.name and not entry.name.startswith('.')]
             print(f"Found {len(log_files)} log files:")
             
-            for log_file in sorted(log_files):
-                file_size = log_file.stat().st_size
-                modified_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-                file_info = {
-                    'name': log_file.name,
-                    'size': file_size,
-                    'modified': modified_time.isoformat()
-                }
-                directory_info['log_files'].append(file_info)
-                directory_info['total_size'] += file_size
-                print(f"   - {log_file.name} ({file_size} bytes, modified: {modified_time})")
+            log_file_infos = [
+                LogFileInfo(log_file.name, st.st_size, st.st_mtime)
+                for log_file in log_files
+                for st in (log_file.stat(),)
+            ]
+            directory_info['log_files'] = log_file_infos
+            directory_info['total_size'] = sum(info.size for info in log_file_infos)
+            
+            # Show only the newest files; heapq picks them without sorting the whole listing
+            out = io.StringIO()  # per-file lines, written to stdout once
+            for info in heapq.nlargest(_LOG_LISTING_LIMIT, log_file_infos, key=attrgetter('modified')):
+                modified_time = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(info.modified))
+                print(f"   - {info.name} ({info.size} bytes, modified: {modified_time})", file=out)
+            if len(log_file_infos) > _LOG_LISTING_LIMIT:
+                print(f"   ... and {len(log_file_infos) - _LOG_LISTING_LIMIT} older files", file=out)
+            sys.stdout.write(out.getvalue())
             
             # Check for expected main log file
             main_log = log_dir / 'monitor.log'
-            directory_info['main_log_exists'] = main_log.exists()
+            directory_info['main_log_exists'] = any(entry.name == 'monitor.log' for entry in log_files)
             
-            if main_log.exists():
+            if directory_info['main_log_exists']:
                 print(f"✅ Main log file exists: {main_log}")
                 success = True
                 message = f"Log directory configured correctly ({len(log_files)} files, {directory_info['total_size']} bytes total)"
@@ -221,35 +255,34 @@ def test_log_directory_structure():
 
 
 def test_timing_and_duplicate_prevention():
-    """Test the 5-minute timing and duplicate prevention logic."""
-    print_subheader("Testing 5-Minute Timing and Duplicate Prevention")
+    """Test the run cursor and duplicate prevention logic."""
+    print_subheader("Testing Run Cursor and Duplicate Prevention")
     
     try:
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = _get_monitor()
         if not monitor:
             return TestResult("Timing Logic", False, "Failed to create monitor instance")
         
-        monitor._initialize_github_client()
+        ensure_github_initialized(monitor)
         
         # Get first repository and workflow for testing
         if not monitor.repos:
             return TestResult("Timing Logic", False, "No repositories available for testing")
         
-        repo_name = list(monitor.repos.keys())[0]
-        repo = monitor.repos[repo_name]
+        repo_name = next(iter(monitor.repos))
+        repo = monitor.github.get_repo(repo_name)
         
         print(f"Testing with repository: {repo_name}")
         
-        # Get workflows
-        workflows = list(repo.get_workflows())
-        if not workflows:
+        # Only the first workflow is used; stop after the first page of the listing
+        workflow = next(iter(repo.get_workflows()), None)
+        if workflow is None:
             return TestResult("Timing Logic", False, "No workflows found")
         
-        workflow = workflows[0]
         print(f"Testing with workflow: {workflow.name}")
         
-        # Get some recent runs
-        runs = list(workflow.get_runs(status='completed'))[:10]
+        # Get some recent runs (islice stops PyGithub from paging past the first page)
+        runs = list(islice(workflow.get_runs(status='completed'), 10))
         
         if not runs:
             return TestResult("Timing Logic", False, "No completed runs found")
@@ -266,62 +299,74 @@ def test_timing_and_duplicate_prevention():
             'run_details': []
         }
         
-        for run in runs:
-            if run.updated_at:
-                time_diff = current_time - run.updated_at
-                minutes_ago = time_diff.total_seconds() / 60
-                
-                run_detail = {
-                    'run_number': run.run_number,
-                    'conclusion': run.conclusion,
-                    'minutes_ago': minutes_ago,
-                    'is_recent': time_diff.total_seconds() <= 300
-                }
-                timing_analysis['run_details'].append(run_detail)
-                
-                status = "✅ RECENT" if time_diff.total_seconds() <= 300 else "⏰ OLD"
-                print(f"  Run #{run.run_number}: {run.conclusion} - {minutes_ago:.1f} minutes ago - {status}")
-                
-                if time_diff.total_seconds() <= 300:
-                    recent_runs.append(run)
-                    timing_analysis['recent_runs'] += 1
-                else:
-                    old_runs.append(run)
-                    timing_analysis['old_runs'] += 1
+        # Ages in seconds for all timed runs in one pass, against a single "now" timestamp
+        now_ts = current_time.timestamp()
+        timed_runs = [run for run in runs if run.updated_at]
+        ages = [now_ts - run.updated_at.timestamp() for run in timed_runs]
+        
+        out = io.StringIO()  # per-run lines, written to stdout once after the loop
+        for run, age in zip(timed_runs, ages):
+            minutes_ago = age / 60
+            is_recent = age <= 300
+            
+            run_detail = {
+                'run_number': run.run_number,
+                'conclusion': run.conclusion,
+                'minutes_ago': minutes_ago,
+                'is_recent': is_recent
+            }
+            timing_analysis['run_details'].append(run_detail)
+            
+            status = "✅ RECENT" if is_recent else "⏰ OLD"
+            print(f"  Run #{run.run_number}: {run.conclusion} - {minutes_ago:.1f} minutes ago - {status}", file=out)
+            
+            if is_recent:
+                recent_runs.append(run)
+                timing_analysis['recent_runs'] += 1
+            else:
+                old_runs.append(run)
+                timing_analysis['old_runs'] += 1
+        sys.stdout.write(out.getvalue())
         
         print(f"\nTiming Summary:")
         print(f"  Recent runs (≤5 min): {len(recent_runs)}")
         print(f"  Old runs (>5 min): {len(old_runs)}")
         
-        # Test the actual monitor logic
+        # Test the actual monitor logic, with the workflow tracked from just before the analyzed runs
         print(f"\nTesting monitor logic...")
-        monitor.state_data = {'executed_runs': set()}
-        new_runs = monitor._get_new_successful_runs(repo_name, workflow)
+        cursor_key = f"{repo_name}:{workflow.id}"
+        start_cursor = min(run.run_number for run in runs) - 1
+        from github_actions_monitor import MonitorState
+        monitor.state_data = MonitorState(cursor={cursor_key: start_cursor})
+        # Fetch once; both passes below filter the same payloads in memory
+        payloads = monitor._fetch_successful_run_payloads(repo_name, workflow)
+        new_runs = monitor._filter_new_successful_runs(repo_name, workflow, payloads)
         
-        print(f"Monitor found {len(new_runs)} new successful runs within 5 minutes")
+        print(f"Monitor found {len(new_runs)} new successful runs after run #{start_cursor}")
         
         monitor_results = []
+        out = io.StringIO()
         for run in new_runs:
-            time_diff = current_time - run.updated_at
-            minutes_ago = time_diff.total_seconds() / 60
+            minutes_ago = (now_ts - run.updated_at.timestamp()) / 60
             run_info = {
                 'run_number': run.run_number,
                 'conclusion': run.conclusion,
                 'minutes_ago': minutes_ago
             }
             monitor_results.append(run_info)
-            print(f"  ✅ Run #{run.run_number}: {run.conclusion} - {minutes_ago:.1f} minutes ago")
+            print(f"  ✅ Run #{run.run_number}: {run.conclusion} - {minutes_ago:.1f} minutes ago", file=out)
+        sys.stdout.write(out.getvalue())
         
         # Test duplicate prevention
         print(f"\nTesting duplicate prevention...")
         if new_runs:
             # Simulate marking runs as executed
             test_run = new_runs[0]
-            run_key = f"{repo_name}:{workflow.id}:{test_run.id}"
-            monitor.state_data['executed_runs'].add(run_key)
+            run_key = (repo_name, workflow.id, test_run.id)
+            monitor.state_data.executed_runs.add(run_key)
             
-            # Try to get new runs again - should be filtered out
-            new_runs_after = monitor._get_new_successful_runs(repo_name, workflow)
+            # Filter again - filtering leaves the cursors alone, so only the executed run drops out
+            new_runs_after = monitor._filter_new_successful_runs(repo_name, workflow, payloads)
             duplicate_prevented = len(new_runs_after) < len(new_runs)
             
             print(f"  Original new runs: {len(new_runs)}")
@@ -346,15 +391,77 @@ def test_timing_and_duplicate_prevention():
         return TestResult("Timing Logic", False, f"Error testing timing logic: {e}")
 
 
+def test_run_cursor_logic():
+    """Test the per-branch run cursors offline, against synthetic run payloads."""
+    print_subheader("Testing Per-Branch Run Cursors")
+    
+    monitor = _get_monitor()
+    if not monitor:
+        return TestResult("Run Cursors", False, "Failed to create monitor instance")
+    
+    from types import SimpleNamespace
+    from github_actions_monitor import MonitorState
+    
+    def payload(run_number, branch):
+        return {'id': 1000 + run_number, 'name': 'CI', 'run_number': run_number, 'status': 'completed',
+                'conclusion': 'success', 'head_branch': branch, 'head_sha': None}
+    
+    def numbers(runs):
+        return [run.run_number for run in runs]
+    
+    repo_name = 'offline/cursor-test'
+    workflow = SimpleNamespace(id=1, name='CI')
+    workflow_key = f"{repo_name}:{workflow.id}"
+    saved = monitor.state_data, monitor._branch_allow, dict(monitor._run_window_floor)
+    checks = {}
+    
+    try:
+        monitor.state_data = MonitorState()
+        monitor._branch_allow = None
+        
+        # A workflow first seen without successful runs starts from 0, so its first run is handled
+        monitor._filter_new_successful_runs(repo_name, workflow, [])
+        checks['first run after empty start'] = (
+            numbers(monitor._filter_new_successful_runs(repo_name, workflow, [payload(1, 'main')])) == [1])
+        
+        # A newer run handled on one branch must not hide an older run finishing later on another
+        monitor.state_data = MonitorState(cursor={workflow_key: 9})
+        new_runs = monitor._filter_new_successful_runs(repo_name, workflow, [payload(11, 'develop')])
+        for run in new_runs:
+            monitor._advance_cursor(repo_name, workflow, run)
+        late = [payload(11, 'develop'), payload(10, 'main'), payload(9, 'main')]
+        checks['late run on another branch'] = (
+            numbers(new_runs) == [11] and numbers(monitor._filter_new_successful_runs(repo_name, workflow, late)) == [10])
+        
+        # Filtering alone never moves a cursor
+        checks['filtering leaves cursors alone'] = (
+            numbers(monitor._filter_new_successful_runs(repo_name, workflow, late)) == [10])
+        
+        # Branch cursors below a full run window are pruned; the workflow baseline stays
+        window = [payload(n, 'main') for n in range(40, 20, -1)]
+        monitor._note_run_window(repo_name, workflow, window, len(window))
+        monitor._prune_branch_cursors()
+        checks['stale branch cursor pruned'] = monitor.state_data.cursor == {workflow_key: 9}
+    except Exception as e:
+        return TestResult("Run Cursors", False, f"Run cursor test failed: {e}")
+    finally:
+        monitor.state_data, monitor._branch_allow = saved[0], saved[1]
+        monitor._run_window_floor.clear()
+        monitor._run_window_floor.update(saved[2])
+    
+    for name, passed in checks.items():
+        print(f"   {'✅' if passed else '❌'} {name}")
+    
+    passed = sum(checks.values())
+    return TestResult("Run Cursors", passed == len(checks), f"Run cursors: {passed}/{len(checks)} checks passed", checks)
+
+
 def test_execution_mapping_logic():
     """Test the execution mapping logic for repository-branch command selection."""
     print_subheader("Testing Execution Mapping Logic")
     
     try:
-        import subprocess
-        import os
-        
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = _get_monitor()
         if not monitor:
             return TestResult("Execution Mapping", False, "Failed to create monitor instance")
         
@@ -368,21 +475,28 @@ def test_execution_mapping_logic():
         
         print("Testing execution mapping logic...")
         
+        # Flat {(repo, branch): commands} index, the same shape the monitor builds at startup
+        flat_map = {
+            (repo, branch): tuple(commands or ())
+            for repo, branches in execution_map.items()
+            for branch, commands in (branches or {}).items()
+        }
+        
         test_scenarios = [
             {
                 'repo': 'your-org/your-frontend-repo',
                 'branch': 'your-branch',
-                'expected_commands': execution_map.get('your-org/your-frontend-repo', {}).get('your-branch', [])
+                'expected_commands': flat_map.get(('your-org/your-frontend-repo', 'your-branch'), ())
             },
             {
                 'repo': 'your-org/your-backend-repo', 
                 'branch': 'your-branch',
-                'expected_commands': execution_map.get('your-org/your-backend-repo', {}).get('your-branch', [])
+                'expected_commands': flat_map.get(('your-org/your-backend-repo', 'your-branch'), ())
             },
             {
                 'repo': 'unknown/repository',
                 'branch': 'main',
-                'expected_commands': execution_map.get('*', {}).get('*', [])
+                'expected_commands': flat_map.get(('*', '*'), ())
             }
         ]
         
@@ -400,7 +514,7 @@ def test_execution_mapping_logic():
                 print(f"   Expected commands: {', '.join(expected)}")
                 
                 # Verify all expected commands exist in definitions
-                missing_commands = [cmd for cmd in expected if cmd not in definitions]
+                missing_commands = sorted(set(expected) - definitions.keys())
                 if missing_commands:
                     print(f"   ❌ Missing command definitions: {', '.join(missing_commands)}")
                     mapping_results.append({
@@ -416,7 +530,7 @@ def test_execution_mapping_logic():
                         'repo': repo,
                         'branch': branch,
                         'success': True,
-                        'commands': expected
+                        'commands': list(expected)
                     })
             else:
                 print(f"   ⚠️  No commands mapped for this repo/branch combination")
@@ -445,7 +559,7 @@ def test_command_logging():
     print_subheader("Testing Command Execution Logging")
     
     try:
-        monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+        monitor = _get_monitor()
         if not monitor:
             return TestResult("Command Logging", False, "Failed to create monitor instance")
         
@@ -468,7 +582,7 @@ def test_command_logging():
         for level, message in test_messages:
             try:
                 log_method = getattr(monitor.logger, level.lower())
-                log_method(f"[COMMAND_TEST] {message}")
+                log_method("[COMMAND_TEST] %s", message)
                 log_results.append((level, True))
                 print(f"   ✅ {level} logging works")
             except Exception as e:
@@ -482,8 +596,8 @@ def test_command_logging():
             test_command = "restart_frontend"
             
             # Simulate command execution logging
-            monitor.logger.info(f"[COMMAND_EXECUTION] Repo: {test_repo}, Branch: {test_branch}, Command: {test_command}")
-            monitor.logger.info(f"[COMMAND_RESULT] Command '{test_command}' executed successfully")
+            monitor.logger.info("[COMMAND_EXECUTION] Repo: %s, Branch: %s, Command: %s", test_repo, test_branch, test_command)
+            monitor.logger.info("[COMMAND_RESULT] Command '%s' executed successfully", test_command)
             
             print("✅ Command execution logging format works")
             command_logging_success = True
@@ -512,15 +626,16 @@ def test_command_logging():
         return TestResult("Command Logging", False, f"Command logging test failed: {e}")
 
 
-def run_system_tests():
-    """Run all system and logging tests."""
-    print_header("GitHub Actions Monitor - System & Logging Tests")
-    
+def _run(tests, summary_lines, failure_message):
+    """Set up the environment, run the given tests and print their summary."""
     # Setup
     load_env()
     setup_python_path()
     create_test_directories()
     
+    # Start from a fresh shared monitor (the config or environment may have changed)
+    _get_monitor.cache_clear()
+    
     # Show environment info
     deps = show_environment_info()
     
@@ -529,16 +644,6 @@ def run_system_tests():
         print("\n❌ PyGithub not available - cannot run full system tests")
         return False
     
-    # Run tests
-    tests = [
-        (test_log_rotation, "Log Rotation"),
-        (test_timezone_configuration, "Timezone Configuration"),
-        (test_log_directory_structure, "Log Directory Structure"),
-        (test_timing_and_duplicate_prevention, "Timing & Duplicate Prevention"),
-        (test_execution_mapping_logic, "Execution Mapping Logic"),
-        (test_command_logging, "Command Logging")
-    ]
-    
     results = []
     test_names = []
     
@@ -551,35 +656,41 @@ def run_system_tests():
     success = print_summary(results, test_names)
     
     if success:
-        print("\n✅ System configuration and logging are working correctly:")
-        print("• Daily log rotation with 30-day retention")
-        print("• Configurable timezone support (default: Asia/Dhaka)")
-        print("• 5-minute timing window for workflow execution")
-        print("• Duplicate prevention for command execution")
-        print("• Repository-branch command mapping")
-        print("• Command execution logging")
+        sys.stdout.write("\n".join(summary_lines) + "\n")
     else:
-        print("\n❌ Some system tests failed. Check the configuration and try again.")
+        print(failure_message)
     
     return success
 
 
-def main():
-    """Main function to run all system tests with proper logging."""
-    # Setup
-    load_env()
-    setup_python_path()
-    create_test_directories()
-    
-    # Show environment info
-    deps = show_environment_info()
+def run_system_tests():
+    """Run all system and logging tests."""
+    print_header("GitHub Actions Monitor - System & Logging Tests")
     
-    # Check if we can proceed
-    if not deps.get('github', False):
-        print("\n❌ PyGithub not available - cannot run full system tests")
-        return False
+    tests = [
+        (test_log_rotation, "Log Rotation"),
+        (test_timezone_configuration, "Timezone Configuration"),
+        (test_log_directory_structure, "Log Directory Structure"),
+        (test_timing_and_duplicate_prevention, "Timing & Duplicate Prevention"),
+        (test_run_cursor_logic, "Run Cursor Logic"),
+        (test_execution_mapping_logic, "Execution Mapping Logic"),
+        (test_command_logging, "Command Logging")
+    ]
     
-    # Run tests
+    return _run(tests, [
+        "\n✅ System configuration and logging are working correctly:",
+        "• Daily log rotation with 30-day retention",
+        "• Configurable timezone support (default: Asia/Dhaka)",
+        "• Run number cursor for new workflow runs",
+        "• Per-branch run cursors and their pruning",
+        "• Duplicate prevention for command execution",
+        "• Repository-branch command mapping",
+        "• Command execution logging"
+    ], "\n❌ Some system tests failed. Check the configuration and try again.")
+
+
+def main():
+    """Main function to run all system tests with proper logging."""
     tests = [
         (test_log_rotation, "Log Rotation"),
         (test_timezone_configuration, "Timezone Configuration"),
@@ -587,27 +698,13 @@ def main():
         (test_timing_and_duplicate_prevention, "Timing & Duplicate Prevention")
     ]
     
-    results = []
-    test_names = []
-    
-    for test_func, test_name in tests:
-        result = run_test_safely(test_func, test_name)
-        results.append(bool(result))
-        test_names.append(test_name)
-    
-    # Summary
-    success = print_summary(results, test_names)
-    
-    if success:
-        print("\nSystem configuration and logging are working correctly:")
-        print("• Daily log rotation with 30-day retention")
-        print("• Configurable timezone support (default: Asia/Dhaka)")
-        print("• 5-minute timing window for workflow execution")
-        print("• Duplicate prevention for command execution")
-    else:
-        print("\nSome system tests failed. Check the configuration and try again.")
-    
-    return success
+    return _run(tests, [
+        "\nSystem configuration and logging are working correctly:",
+        "• Daily log rotation with 30-day retention",
+        "• Configurable timezone support (default: Asia/Dhaka)",
+        "• Run number cursor for new workflow runs",
+        "• Duplicate prevention for command execution"
+    ], "\nSome system tests failed. Check the configuration and try again.")
 
 
 if __name__ == "__main__":
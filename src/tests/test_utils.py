@@ -7,27 +7,47 @@ Reusable components for testing the monitor functionality.
 
 import os
 import sys
+import time
+import bisect
+import copy
+import functools
+import importlib.metadata
+import importlib.util
+import traceback
 from pathlib import Path
 from datetime import datetime, timezone
 
+# Project root (two levels up from src/tests), resolved once at import
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
 # Setup Python path for imports
 def setup_python_path():
     """Add project root to Python path for imports."""
-    # Get the project root (two levels up from src/tests)
-    project_root = Path(__file__).parent.parent.parent
-    sys.path.insert(0, str(project_root))
+    project_root = str(_PROJECT_ROOT)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+@functools.lru_cache(maxsize=1)
+def _env_file_path():
+    """Return (path, exists) for the project's .env file, checked with a single stat."""
+    env_path = _PROJECT_ROOT / '.env'
+    try:
+        os.stat(env_path)
+    except FileNotFoundError:
+        return env_path, False
+    return env_path, True
 
 # Load environment variables from .env file if it exists
+@functools.lru_cache(maxsize=None)
 def load_env():
-    """Load environment variables from .env file."""
+    """Load environment variables from .env file (once per process)."""
     try:
         from dotenv import load_dotenv
         # Look for .env file in project root
-        project_root = Path(__file__).parent.parent.parent
-        env_path = project_root / '.env'
-        if env_path.exists():
+        env_path, env_exists = _env_file_path()
+        if env_exists:
             load_dotenv(env_path)
-            print(f"✅ Loaded .env file from: {env_path.absolute()}")
+            print(f"✅ Loaded .env file from: {env_path}")
             return True
     except ImportError:
         pass
@@ -43,17 +63,18 @@ def print_subheader(title, width=40):
     """Print a formatted subheader for test subsections."""
     print(f"\n=== {title} ===")
 
+_PASS, _FAIL = "✅ PASS", "❌ FAIL"
+
 def print_summary(results, test_names=None):
-    """Print a formatted test summary."""
+    """Print a formatted test summary (results are booleans)."""
     print_header("TEST SUMMARY")
     
-    passed = sum(results)
+    passed = results.count(True)
     total = len(results)
     
     if test_names:
-        for i, (name, result) in enumerate(zip(test_names, results)):
-            status = "✅ PASS" if result else "❌ FAIL"
-            print(f"{status} - {name}")
+        lines = [f"{_PASS if result else _FAIL} - {name}" for name, result in zip(test_names, results)]
+        sys.stdout.write("\n".join(lines) + "\n")
     
     if passed == total:
         print(f"\n✅ All {total} tests passed!")
@@ -62,18 +83,20 @@ def print_summary(results, test_names=None):
     
     return passed == total
 
+_TOKEN_HELP_MSG = (
+    "⚠️  GITHUB_TOKEN environment variable not set\n"
+    "   You can set it by:\n"
+    "   - Creating a .env file with GITHUB_TOKEN=your_token\n"
+    "   - Setting environment variable: export GITHUB_TOKEN=your_token\n"
+)
+
 def check_github_token():
     """Check if GitHub token is available."""
-    github_token = os.getenv('GITHUB_TOKEN', 'Not set')
-    if github_token != 'Not set':
+    if os.environ.get('GITHUB_TOKEN'):
         print("✅ GITHUB_TOKEN environment variable is set")
         return True
-    else:
-        print("⚠️  GITHUB_TOKEN environment variable not set")
-        print("   You can set it by:")
-        print("   - Creating a .env file with GITHUB_TOKEN=your_token")
-        print("   - Setting environment variable: export GITHUB_TOKEN=your_token")
-        return False
+    sys.stdout.write(_TOKEN_HELP_MSG)
+    return False
 
 def check_dependencies():
     """Check if required dependencies are installed."""
@@ -83,36 +106,34 @@ def check_dependencies():
         'dotenv': 'python-dotenv'
     }
     
+    # One scan of the installed distributions' metadata answers presence and version for all
+    # of them, without importing any (PyGithub and yaml are slow to import)
+    installed = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            installed.setdefault(name.lower().replace('_', '-'), dist.version)
+    
     results = {}
     
     for module, package in dependencies.items():
-        try:
-            if module == 'github':
-                import github
-                try:
-                    version = github.__version__
-                except AttributeError:
-                    try:
-                        import pkg_resources
-                        version = pkg_resources.get_distribution("PyGithub").version
-                    except:
-                        version = "unknown"
-                print(f"✅ {package} version: {version}")
-                results[module] = True
-            elif module == 'yaml':
-                import yaml
-                print(f"✅ {package} available")
-                results[module] = True
-            elif module == 'dotenv':
-                from dotenv import load_dotenv
-                print(f"✅ {package} available (.env file support)")
-                results[module] = True
-        except ImportError:
+        version = installed.get(package.lower().replace('_', '-'))
+        # Importable without package metadata (e.g. vendored): present, version unknown
+        if version is None and importlib.util.find_spec(module) is not None:
+            version = "unknown"
+        results[module] = version is not None
+        
+        if not results[module]:
             if module == 'dotenv':
                 print(f"⚠️  {package} not installed - run: pip install {package}")
             else:
                 print(f"❌ {package} not installed - run: pip install -r requirements.txt")
-            results[module] = False
+        elif module == 'github':
+            print(f"✅ {package} version: {version}")
+        elif module == 'yaml':
+            print(f"✅ {package} available")
+        elif module == 'dotenv':
+            print(f"✅ {package} available (.env file support)")
     
     return results
 
@@ -121,13 +142,12 @@ def show_environment_info():
     print_subheader("Environment Information")
     print(f"Python version: {sys.version}")
     print(f"Current working directory: {os.getcwd()}")
-    print(f"Project root: {Path(__file__).parent.parent.parent}")
+    print(f"Project root: {_PROJECT_ROOT}")
     
     # Check for .env file
-    project_root = Path(__file__).parent.parent.parent
-    env_file = project_root / '.env'
-    if env_file.exists():
-        print(f"✅ .env file found: {env_file.absolute()}")
+    env_file, env_exists = _env_file_path()
+    if env_exists:
+        print(f"✅ .env file found: {env_file}")
     else:
         print(f"⚠️  .env file not found (you can create one from .env.example)")
     
@@ -137,25 +157,69 @@ def show_environment_info():
     # Check dependencies
     return check_dependencies()
 
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path, mtime_ns):
+    """Parse a YAML config file; keyed by mtime so an edited file is parsed again."""
+    from github_actions_monitor import _YamlLoader
+    import yaml
+    
+    return yaml.load(Path(path).read_bytes(), Loader=_YamlLoader)
+
+setup_python_path()
+try:
+    from github_actions_monitor import GitHubActionsMonitor
+except ImportError as e:
+    # Reported by create_monitor_instance; the other utilities work without the monitor
+    GitHubActionsMonitor = None
+    _monitor_import_error = e
+else:
+    _monitor_import_error = None
+    
+    class _CachedConfigMonitor(GitHubActionsMonitor):
+        """Monitor whose config is parsed once per file modification."""
+        # Tests create many monitors from the same file
+        def _load_config(self):
+            try:
+                mtime_ns = Path(self.config_path).stat().st_mtime_ns
+            except OSError:
+                return super()._load_config()
+            config = copy.deepcopy(_load_config_cached(str(self.config_path), mtime_ns))
+            return self._substitute_env_vars(config)
+
 def create_monitor_instance(config_path="config.yaml", local_mode=True):
     """Create a GitHubActionsMonitor instance for testing."""
     try:
-        # Ensure Python path is set up
-        setup_python_path()
-        
-        from github_actions_monitor import GitHubActionsMonitor
+        if _monitor_import_error is not None:
+            raise _monitor_import_error
         
         # Use absolute path for config if it's relative
         if not Path(config_path).is_absolute():
-            project_root = Path(__file__).parent.parent.parent
-            config_path = project_root / config_path
+            config_path = _PROJECT_ROOT / config_path
         
-        monitor = GitHubActionsMonitor(config_path=str(config_path), local_mode=local_mode)
+        monitor = _CachedConfigMonitor(config_path=str(config_path), local_mode=local_mode)
         return monitor
     except Exception as e:
         print(f"❌ Error creating monitor instance: {e}")
         return None
 
+def ensure_github_initialized(monitor):
+    """Connect the monitor to GitHub unless an earlier test already did."""
+    if monitor._http is None or not monitor.repos:
+        monitor._initialize_github_client()
+    return monitor
+
+@functools.lru_cache(maxsize=1)
+def _get_shared_monitor():
+    """Monitor shared by the tests of one run, connected to GitHub once."""
+    monitor = create_monitor_instance(str(get_config_path()), local_mode=True)
+    if monitor:
+        try:
+            ensure_github_initialized(monitor)
+        except Exception as e:
+            # Config-only tests can still use the instance; connection tests report the failure
+            print(f"⚠️  GitHub client initialization failed: {e}")
+    return monitor
+
 def run_test_safely(test_func, test_name):
     """Run a test function safely with error handling."""
     try:
@@ -166,27 +230,28 @@ def run_test_safely(test_func, test_name):
         return False
     except Exception as e:
         print(f"❌ Test '{test_name}' failed with exception: {e}")
-        import traceback
-        traceback.print_exc()
+        # Stack formatting is opt-in and bounded; most failures are explained by the message
+        if os.environ.get('TEST_VERBOSE_TB'):
+            traceback.print_exception(type(e), e, e.__traceback__, limit=10, chain=False)
+        else:
+            print("   (set TEST_VERBOSE_TB=1 to show the traceback)")
         return False
 
+# Unit thresholds and (divisor, format) per unit; bisect picks the row for a value
+_AGE_BOUNDS = (3600, 86400)
+_AGE_UNITS = ((60, "{:.0f}m ago"), (3600, "{:.1f}h ago"), (86400, "{:.0f}d ago"))
+_DURATION_BOUNDS = (60, 3600)
+_DURATION_UNITS = ((1, "{:.1f}s"), (60, "{:.1f}m"), (3600, "{:.1f}h"))
+
 def format_age(seconds):
     """Format age in seconds to human-readable format."""
-    if seconds < 3600:  # Less than 1 hour
-        return f"{seconds/60:.0f}m ago"
-    elif seconds < 86400:  # Less than 1 day
-        return f"{seconds/3600:.1f}h ago"
-    else:  # More than 1 day
-        return f"{seconds/86400:.0f}d ago"
+    divisor, fmt = _AGE_UNITS[bisect.bisect_right(_AGE_BOUNDS, seconds)]
+    return fmt.format(seconds / divisor)
 
 def format_duration(seconds):
     """Format duration in seconds to human-readable format."""
-    if seconds < 60:
-        return f"{seconds:.1f}s"
-    elif seconds < 3600:
-        return f"{seconds/60:.1f}m"
-    else:
-        return f"{seconds/3600:.1f}h"
+    divisor, fmt = _DURATION_UNITS[bisect.bisect_right(_DURATION_BOUNDS, seconds)]
+    return fmt.format(seconds / divisor)
 
 class TestResult:
     """Class to store test results with metadata."""
@@ -196,53 +261,72 @@ class TestResult:
         self.passed = passed
         self.message = message
         self.details = details or {}
-        self.timestamp = datetime.now(timezone.utc)
+        self._ts_ns = time.time_ns()
+    
+    @property
+    def timestamp(self):
+        """When the result was created (UTC); the datetime is only built on access."""
+        return datetime.fromtimestamp(self._ts_ns / 1e9, tz=timezone.utc)
     
     def __bool__(self):
         return self.passed
     
     def __str__(self):
-        status = "✅ PASS" if self.passed else "❌ FAIL"
-        return f"{status} - {self.name}: {self.message}"
+        return f"{_PASS if self.passed else _FAIL} - {self.name}: {self.message}"
 
 def create_test_directories():
     """Create necessary test directories."""
     directories = ['logs', 'data', 'test_logs', 'test_state', 'test_health']
     
-    # Create directories relative to project root
-    project_root = Path(__file__).parent.parent.parent
+    # One scan of the project root tells which directories already exist
+    with os.scandir(_PROJECT_ROOT) as it:
+        existing = {entry.name for entry in it if entry.is_dir()}
     
+    # Create the missing directories relative to project root
     for dir_name in directories:
-        dir_path = project_root / dir_name
+        if dir_name in existing:
+            continue
         try:
-            dir_path.mkdir(exist_ok=True)
+            (_PROJECT_ROOT / dir_name).mkdir()
+        except FileExistsError:
+            pass  # Created concurrently since the scan
         except Exception as e:
             print(f"⚠️  Could not create directory {dir_name}: {e}")
 
-def cleanup_test_files():
-    """Clean up test files and directories."""
-    project_root = Path(__file__).parent.parent.parent
-    test_patterns = [
-        'test_logs/*',
-        'test_state/*',
-        'test_health/*'
-    ]
-    
-    for pattern in test_patterns:
-        for file_path in project_root.glob(pattern):
+def _purge_test_dir(dir_name):
+    """Remove everything inside one test directory (missing directories are skipped)."""
+    import shutil
+    
+    try:
+        it = os.scandir(_PROJECT_ROOT / dir_name)
+    except FileNotFoundError:
+        return
+    
+    # DirEntry file types come from the directory read, so no per-entry stat is needed
+    with it:
+        for entry in it:
             try:
-                if file_path.is_file():
-                    file_path.unlink()
-                elif file_path.is_dir():
-                    import shutil
-                    shutil.rmtree(file_path)
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
             except Exception as e:
-                print(f"⚠️  Could not clean up {file_path}: {e}")
+                print(f"⚠️  Could not clean up {entry.path}: {e}")
+
+def cleanup_test_files():
+    """Clean up test files and directories."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # The directories are independent and removal is syscall-bound, so purge them concurrently
+    test_dirs = ('test_logs', 'test_state', 'test_health')
+    with ThreadPoolExecutor(max_workers=len(test_dirs)) as executor:
+        list(executor.map(_purge_test_dir, test_dirs))
 
 def get_project_root():
-    """Get the project root directory."""
-    return Path(__file__).parent.parent.parent
+    """Get the project root directory (fixed for the life of the process)."""
+    return _PROJECT_ROOT
 
+@functools.lru_cache(maxsize=None)
 def get_config_path(config_name="config.yaml"):
     """Get the full path to a config file."""
     return get_project_root() / config_name
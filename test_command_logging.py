@@ -6,15 +6,21 @@ This simulates what happens when the monitor executes commands.
 
 import os
 import sys
-import json
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+# Prefer the libyaml-backed C dumper for writing the test config
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
 
 # Add the current directory to the Python path
 sys.path.insert(0, '.')
 
-from github_actions_monitor import GitHubActionsMonitor
-
 def create_test_config():
     """Create a test configuration with various command scenarios."""
     config = {
@@ -86,39 +92,36 @@ def create_test_config():
     }
     return config
 
+# The test config is fixed, so it is serialized once at import
+_CFG_BYTES = yaml.dump(create_test_config(), Dumper=_YamlDumper, encoding='utf-8')
+
 def create_mock_workflow_run():
     """Create a mock workflow run object for testing."""
-    class MockWorkflowRun:
-        def __init__(self):
-            self.id = 12345
-            self.run_number = 42
-            self.name = "Test Workflow"
-            self.head_branch = "main"
-            self.head_sha = "abc123def456"
-            self.display_title = "Test commit message"
-    
-    class MockWorkflow:
-        def __init__(self):
-            self.id = 67890
-            self.name = "test-workflow"
-    
-    return MockWorkflow(), MockWorkflowRun()
+    workflow = SimpleNamespace(id=67890, name="test-workflow")
+    workflow_run = SimpleNamespace(
+        id=12345,
+        run_number=42,
+        name="Test Workflow",
+        head_branch="main",
+        head_sha="abc123def456",
+        display_title="Test commit message"
+    )
+    return workflow, workflow_run
 
 def test_command_execution():
     """Test the enhanced command execution logging."""
     print("Testing Enhanced Command Execution Logging")
     print("=" * 50)
     
-    # Create test config
-    config = create_test_config()
-    
-    # Write config to temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        import yaml
-        yaml.dump(config, f)
+    # Write the pre-serialized test config to a temporary file
+    with tempfile.NamedTemporaryFile(suffix='.yaml', delete=False) as f:
+        f.write(_CFG_BYTES)
         config_path = f.name
     
     try:
+        # Imported here so loading this module (e.g. for create_test_config) skips the monitor's dependencies
+        from github_actions_monitor import GitHubActionsMonitor
+        
         # Create monitor instance in local mode
         monitor = GitHubActionsMonitor(config_path=config_path, local_mode=True)
         
@@ -143,13 +146,12 @@ def test_command_execution():
         traceback.print_exc()
     
     finally:
-        # Clean up temporary files
-        try:
-            os.unlink(config_path)
-            if os.path.exists('./test_state.json'):
-                os.unlink('./test_state.json')
-        except Exception:
-            pass
+        # Clean up temporary files (unlink directly; a missing file is fine)
+        for path in (config_path, './test_state.json'):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
 
 if __name__ == "__main__":
     test_command_execution()